@@ -68,6 +68,14 @@ cp $ignore_file $sdk_output_folder
 # remove the verbose description
 cat $swagger_file | jq -r '.info.description |= "FINBOURNE Technology"' > $sdk_output_folder/swagger.json
 
+# mark the paged list operations (those taking a page token and returning a PagedResourceListOf*)
+# so that api.mustache generates their *_iter_pages and *_iter_items methods
+jq '(.paths[][] | objects | select(
+        ((.parameters // []) | any(.in == "query" and .name == "page"))
+        and ([.responses["200"].content[]?.schema["$ref"]?] | any(. != null and test("/PagedResourceListOf")))
+    )) += {"x-fbn-paged": true}' $sdk_output_folder/swagger.json > $sdk_output_folder/swagger.json.tmp
+mv $sdk_output_folder/swagger.json.tmp $sdk_output_folder/swagger.json
+
 echo "[INFO] generating sdk version: ${PACKAGE_VERSION}"
 
 # generate the SDK
@@ -0,0 +1,118 @@
+"""Micro-benchmark for ApiClient response deserialization.
+
+Compares resolving the response type string for every item, as ApiClient.__deserialize
+did before deserializers were compiled, against the compiled, cached deserializers:
+
+- a list of dicts of primitives, where resolving the type is most of the cost
+- a list of models, e.g. List[Portfolio], where each item is also a getattr on the
+  models package and a from_dict
+- many small ResourceListOf* responses, where the type is resolved once per response
+
+Run from the sdk directory with:
+    poetry run python -m test.benchmarks.bench_deserialize
+"""
+import datetime
+import re
+import timeit
+
+from dateutil.parser import parse
+
+import TO_BE_REPLACED.models as models
+from TO_BE_REPLACED.configuration import Configuration
+from TO_BE_REPLACED.extensions.api_client import SyncApiClient
+from test.unit.model_samples import model_classes, sample_dict
+
+ROWS = 50_000
+RESPONSES = 10_000
+
+
+def resolve_per_item(api_client, data, klass):
+    """The previous behaviour, a copy of ApiClient.__deserialize before deserializers were
+    compiled, which re-parses the type string and looks models up for every item"""
+    if data is None:
+        return None
+
+    if isinstance(klass, str):
+        if klass.startswith("List["):
+            sub_kls = re.match(r"List\[(.*)]", klass).group(1)
+            return [resolve_per_item(api_client, sub_data, sub_kls) for sub_data in data]
+
+        if klass.startswith("Dict["):
+            sub_kls = re.match(r"Dict\[([^,]*), (.*)]", klass).group(2)
+            return {k: resolve_per_item(api_client, v, sub_kls) for k, v in data.items()}
+
+        # convert str to class
+        if klass in api_client.NATIVE_TYPES_MAPPING:
+            klass = api_client.NATIVE_TYPES_MAPPING[klass]
+        else:
+            klass = getattr(models, klass)
+
+    if klass in api_client.PRIMITIVE_TYPES:
+        try:
+            return klass(data)
+        except UnicodeEncodeError:
+            return str(data)
+        except TypeError:
+            return data
+    elif klass == object:
+        return data
+    elif klass == datetime.date:
+        return parse(data).date()
+    elif klass == datetime.datetime:
+        return parse(data)
+    else:
+        return klass.from_dict(data)
+
+
+def find_model(names, prefixes=()):
+    """Returns the name and a sample of the first of the named models, or of the models
+    whose names start with one of the prefixes, which sample data can be built for"""
+    classes = {klass.__name__: klass for klass in model_classes()}
+    candidates = [name for name in names if name in classes]
+    candidates += sorted(name for name in classes if name.startswith(tuple(prefixes)) and name not in candidates)
+    for name in candidates:
+        sample = sample_dict(classes[name])
+        if sample is not None:
+            return name, sample
+    return None, None
+
+
+def compare(api_client, response_type, responses, items_per_response):
+    deserializer = api_client.get_deserializer(response_type)
+    assert [deserializer(data) for data in responses[:10]] == [
+        resolve_per_item(api_client, data, response_type) for data in responses[:10]
+    ]
+
+    per_item = min(timeit.repeat(
+        lambda: [resolve_per_item(api_client, data, response_type) for data in responses], number=1, repeat=5))
+    compiled = min(timeit.repeat(lambda: [deserializer(data) for data in responses], number=1, repeat=5))
+
+    count = len(responses) * items_per_response
+    unit = "item" if items_per_response > 1 else "response"
+    print(f"{len(responses)} x {response_type} ({count} {unit}s)")
+    print(f"  per item type resolution: {per_item / count * 1e9:8.0f} ns/{unit}")
+    print(f"  compiled deserializer:    {compiled / count * 1e9:8.0f} ns/{unit}")
+    print(f"  speed up:                 {per_item / compiled:8.1f}x")
+
+
+def main():
+    api_client = SyncApiClient(Configuration())
+
+    rows = [{"units": i, "cost": i * 2, "version": 1} for i in range(ROWS)]
+    compare(api_client, "List[Dict[str, int]]", [rows], ROWS)
+
+    name, sample = find_model(["Portfolio", "Holding"])
+    if name is None:
+        print("no models with sample data in this package")
+    else:
+        compare(api_client, f"List[{name}]", [[sample] * ROWS], ROWS)
+
+    name, sample = find_model(["ResourceListOfPortfolio"], prefixes=["ResourceListOf", "PagedResourceListOf"])
+    if name is None:
+        print("no ResourceListOf* models with sample data in this package")
+    else:
+        compare(api_client, name, [sample] * RESPONSES, 1)
+
+
+if __name__ == "__main__":
+    main()
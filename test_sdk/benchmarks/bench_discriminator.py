@@ -0,0 +1,63 @@
+"""Micro-benchmark for deserializing lists of polymorphic models.
+
+Builds a mixed list of every subtype of the polymorphic model with the most
+subtypes (LusidInstrument where there is one) and compares resolving the
+subtype of each item by name from the models package (the previous behaviour)
+against the parent model's table of resolved classes.
+
+Items are built with from_trusted_dict so that the cost of validating them
+doesn't hide the cost of dispatching them.
+
+Run from the sdk directory with:
+    poetry run python -m test.benchmarks.bench_discriminator
+"""
+import timeit
+
+import TO_BE_REPLACED.models as models
+
+ROWS = 50_000
+
+
+def find_parent():
+    """Returns the polymorphic model with the most subtypes"""
+    parents = {}
+    for name in models.__all__:
+        klass = getattr(models, name)
+        value_class_map = getattr(klass, f"_{name}__discriminator_value_class_map", None)
+        if value_class_map:
+            parents[name] = klass
+    if not parents:
+        raise SystemExit("no polymorphic models in this package")
+    if "LusidInstrument" in parents:
+        return parents["LusidInstrument"]
+    return max(parents.values(), key=lambda klass: len(getattr(klass, f"_{klass.__name__}__discriminator_value_class_map")))
+
+
+def main():
+    parent = find_parent()
+    name = parent.__name__
+    property_name = getattr(parent, f"_{name}__discriminator_property_name")
+    values = list(getattr(parent, f"_{name}__discriminator_value_class_map"))
+    data = [{property_name: values[i % len(values)]} for i in range(ROWS)]
+    get_discriminator_class = getattr(parent, f"_{name}__get_discriminator_class")
+
+    def by_name(obj):
+        """The previous behaviour - looks up the class by name for every item"""
+        return getattr(models, parent.get_discriminator_value(obj))
+
+    assert [by_name(obj) for obj in data[:len(values)]] == [get_discriminator_class(obj) for obj in data[:len(values)]]
+
+    lookup_by_name = min(timeit.repeat(lambda: [by_name(obj) for obj in data], number=1, repeat=5))
+    lookup_table = min(timeit.repeat(lambda: [get_discriminator_class(obj) for obj in data], number=1, repeat=5))
+    by_name_total = min(timeit.repeat(lambda: [by_name(obj).from_trusted_dict(obj) for obj in data], number=1, repeat=5))
+    table_total = min(timeit.repeat(lambda: [parent.from_trusted_dict(obj) for obj in data], number=1, repeat=5))
+
+    print(f"{ROWS} items of {len(values)} subtypes of {name}")
+    print(f"dispatch by name:         {lookup_by_name / ROWS * 1e9:8.0f} ns/item")
+    print(f"dispatch by table:        {lookup_table / ROWS * 1e9:8.0f} ns/item")
+    print(f"deserialize, by name:     {by_name_total / ROWS * 1e9:8.0f} ns/item")
+    print(f"deserialize, by table:    {table_total / ROWS * 1e9:8.0f} ns/item")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark for many concurrent async requests over HTTP/1.1 and HTTP/2.
+
+Sends REQUESTS concurrent GETs through the aiohttp rest client to a local HTTP/1.1
+server, and through the Http2RESTClientObject to a local HTTP/2 server (cleartext,
+with prior knowledge), both of which answer each request after LATENCY seconds to
+stand in for the API. Prints the time taken and the number of connections each
+client opened: over HTTP/1.1 every request in flight needs its own connection (and
+against the API, its own TLS handshake), over HTTP/2 they share a few.
+
+Over loopback and without TLS opening a connection costs little, so the HTTP/1.1
+time is a lower bound of what it is against the API.
+
+Needs the http2 extra to be installed. Run from the sdk directory with:
+    poetry run python -m test.benchmarks.bench_http2
+"""
+import asyncio
+import time
+
+import h2.config
+import h2.connection
+import h2.events
+from aiohttp import web
+
+from TO_BE_REPLACED.configuration import Configuration
+from TO_BE_REPLACED.extensions.http2_rest import Http2RESTClientObject
+from TO_BE_REPLACED.rest import RESTClientObject
+
+REQUESTS = 1000
+LATENCY = 0.05
+BODY = b'{"values": [{"id": 1, "name": "portfolio"}], "href": "https://www.lusid.com/api/portfolios"}'
+
+
+class Http2StandIn(asyncio.Protocol):
+    """Answers each HTTP/2 request with BODY after LATENCY seconds"""
+
+    connections = 0
+
+    def connection_made(self, transport):
+        Http2StandIn.connections += 1
+        self.transport = transport
+        self.conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        self.conn.initiate_connection()
+        self.transport.write(self.conn.data_to_send())
+
+    def data_received(self, data):
+        for event in self.conn.receive_data(data):
+            if isinstance(event, h2.events.StreamEnded):
+                asyncio.get_running_loop().call_later(LATENCY, self.respond, event.stream_id)
+        self.transport.write(self.conn.data_to_send())
+
+    def respond(self, stream_id):
+        if self.transport.is_closing():
+            return
+        self.conn.send_headers(stream_id, [
+            (":status", "200"),
+            ("content-type", "application/json"),
+            ("content-length", str(len(BODY))),
+        ])
+        self.conn.send_data(stream_id, BODY, end_stream=True)
+        self.transport.write(self.conn.data_to_send())
+
+
+async def start_http1_stand_in():
+    """Returns a runner for an HTTP/1.1 server answering with BODY after LATENCY seconds,
+    and the set of the connections it has accepted"""
+    connections = set()
+
+    async def handle(request):
+        connections.add(id(request.transport))
+        await asyncio.sleep(LATENCY)
+        return web.Response(body=BODY, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1], connections
+
+
+async def run(rest_client, url):
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(rest_client.get_request(url) for _ in range(REQUESTS)))
+    elapsed = time.perf_counter() - start
+    assert all(response.data == BODY for response in responses)
+    await rest_client.close()
+    return elapsed
+
+
+async def main():
+    runner, http1_port, http1_connections = await start_http1_stand_in()
+    http2_server = await asyncio.get_running_loop().create_server(Http2StandIn, "127.0.0.1", 0)
+    http2_port = http2_server.sockets[0].getsockname()[1]
+
+    config = Configuration(host="http://127.0.0.1")
+    http1_elapsed = await run(RESTClientObject(config), f"http://127.0.0.1:{http1_port}/api/portfolios")
+    http2_elapsed = await run(Http2RESTClientObject(config, http1=False), f"http://127.0.0.1:{http2_port}/api/portfolios")
+
+    await runner.cleanup()
+    http2_server.close()
+
+    print(f"{REQUESTS} concurrent requests, {LATENCY * 1e3:.0f} ms server latency, connection_pool_maxsize={config.connection_pool_maxsize}")
+    print(f"HTTP/1.1 (aiohttp): {http1_elapsed * 1e3:8.0f} ms, {len(http1_connections):4d} connections")
+    print(f"HTTP/2 (httpx):     {http2_elapsed * 1e3:8.0f} ms, {Http2StandIn.connections:4d} connections")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
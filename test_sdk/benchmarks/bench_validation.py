@@ -0,0 +1,67 @@
+"""Micro-benchmark for the argument validation of api methods.
+
+Compares the per-call cost of an upsert method taking a 10k item request body with
+the api client's client_side_validation on (every item is re-validated by pydantic)
+and off.
+
+Run from the sdk directory with:
+    poetry run python -m test.benchmarks.bench_validation
+"""
+import timeit
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from pydantic.v1 import BaseModel, StrictFloat, StrictStr, conlist
+
+from TO_BE_REPLACED.validation import validate_arguments
+
+ITEMS = 10_000
+
+
+class UpsertRequest(BaseModel):
+    """Shaped like a typical transaction request"""
+    transaction_id: StrictStr
+    type: StrictStr
+    instrument_identifiers: Dict[str, StrictStr]
+    transaction_date: StrictStr
+    units: StrictFloat
+    price: Optional[StrictFloat] = None
+    properties: Optional[Dict[str, StrictStr]] = None
+
+
+class BenchmarkApi:
+    def __init__(self, client_side_validation):
+        self.api_client = SimpleNamespace(client_side_validation=client_side_validation)
+
+    @validate_arguments
+    def upsert(self, scope: StrictStr, code: StrictStr, request_body: conlist(UpsertRequest), **kwargs):
+        return len(request_body)
+
+
+def main():
+    request_body = [
+        UpsertRequest(
+            transaction_id=f"txn-{i}",
+            type="Buy",
+            instrument_identifiers={"Instrument/default/Figi": "BBG000B9XRY4"},
+            transaction_date="2024-01-01T00:00:00Z",
+            units=100.0,
+            price=1.5,
+            properties={"Transaction/default/Broker": "broker"},
+        )
+        for i in range(ITEMS)
+    ]
+    validating = BenchmarkApi(client_side_validation=True)
+    trusting = BenchmarkApi(client_side_validation=False)
+    assert validating.upsert("scope", "code", request_body) == trusting.upsert("scope", "code", request_body) == ITEMS
+
+    validated = min(timeit.repeat(lambda: validating.upsert("scope", "code", request_body), number=1, repeat=5))
+    unvalidated = min(timeit.repeat(lambda: trusting.upsert("scope", "code", request_body), number=1, repeat=5))
+
+    print(f"upsert with a {ITEMS} item request body")
+    print(f"client_side_validation=True:  {validated * 1e3:10.3f} ms/call")
+    print(f"client_side_validation=False: {unvalidated * 1e3:10.3f} ms/call")
+
+
+if __name__ == "__main__":
+    main()
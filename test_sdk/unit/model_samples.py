@@ -0,0 +1,170 @@
+"""Builds sample data for the generated models, for tests which run against every model
+of the sdk rather than models of a particular API"""
+import ast
+import datetime
+import enum
+import typing
+
+from pydantic.v1 import BaseModel, ValidationError
+
+import TO_BE_REPLACED.models as models
+
+# how deeply models nested in models are given sample values, to stop at recursive models
+MAX_DEPTH = 3
+_NO_SAMPLE = object()
+_samples = {}
+
+
+def model_classes():
+    """Yields the generated models with from_dict and from_trusted_dict methods"""
+    for name in models.__all__:
+        klass = getattr(models, name)
+        if isinstance(klass, type) and issubclass(klass, BaseModel) and hasattr(klass, "from_trusted_dict"):
+            yield klass
+
+
+def discriminator_map(klass):
+    """Returns the discriminator property name and value class map of a polymorphic model, or None"""
+    name = klass.__name__
+    value_class_map = klass.__dict__.get(f"_{name}__discriminator_value_class_map")
+    if not value_class_map:
+        return None
+    return klass.__dict__[f"_{name}__discriminator_property_name"], value_class_map
+
+
+def sample_value(type_, depth=0):
+    """Returns a JSON value which the model field of the type accepts"""
+    if type_ is None or type_ is type(None):
+        return _NO_SAMPLE
+    origin = typing.get_origin(type_)
+    if origin is typing.Union:
+        args = [arg for arg in typing.get_args(type_) if arg is not type(None)]
+        return sample_value(args[0], depth) if args else _NO_SAMPLE
+    if origin in (list, typing.List):
+        item = sample_value(typing.get_args(type_)[0], depth)
+        return _NO_SAMPLE if item is _NO_SAMPLE else [item]
+    if origin in (dict, typing.Dict):
+        value = sample_value(typing.get_args(type_)[1], depth)
+        return _NO_SAMPLE if value is _NO_SAMPLE else {"key": value}
+    if not isinstance(type_, type):
+        return "a"
+    if issubclass(type_, list) and hasattr(type_, "item_type"):
+        # conlist
+        item = sample_value(type_.item_type, depth)
+        return _NO_SAMPLE if item is _NO_SAMPLE else [item] * max(type_.min_items or 1, 1)
+    if issubclass(type_, datetime.datetime):
+        return "2024-01-02T03:04:05.123456+00:00"
+    if issubclass(type_, datetime.date):
+        return "2024-01-02"
+    if issubclass(type_, enum.Enum):
+        return next(iter(type_)).value
+    if issubclass(type_, bool):
+        return True
+    if issubclass(type_, int):
+        return max(getattr(type_, "ge", None) or 1, 1)
+    if issubclass(type_, float):
+        return 1.5
+    if issubclass(type_, str):
+        return "a" * max(getattr(type_, "min_length", None) or 1, 1)
+    if issubclass(type_, BaseModel):
+        if depth >= MAX_DEPTH:
+            return _NO_SAMPLE
+        sample = sample_dict(type_, depth=depth + 1)
+        return _NO_SAMPLE if sample is None else sample
+    return "a"
+
+
+def sample_dict(klass, overrides=None, depth=0):
+    """Returns a dict which klass.from_dict accepts, or None if one can't be found
+
+    Each field is given a sample value, then the optional fields which fail validation are
+    dropped and the enums which fail are given one of their values.
+    """
+    key = (klass, tuple(sorted((overrides or {}).items())))
+    if key in _samples:
+        return _samples[key]
+    _samples[key] = None
+    polymorphic = discriminator_map(klass)
+    if polymorphic is not None:
+        # the sample of the first subtype which has one
+        property_name, value_class_map = polymorphic
+        sample = None
+        for value, class_name in value_class_map.items():
+            sample = sample_dict(getattr(models, class_name), {property_name: value}, depth)
+            if sample is not None:
+                break
+        _samples[key] = sample
+        return sample
+
+    fields = {field.alias: field for name, field in klass.__fields__.items()
+              if name not in ("additional_properties", "discriminator_value_class_map")}
+    names = {field.name: alias for alias, field in fields.items()}
+    values = {}
+    for alias, field in fields.items():
+        value = sample_value(field.outer_type_, depth)
+        if value is _NO_SAMPLE:
+            if field.required:
+                return None
+        else:
+            values[alias] = value
+    values.update(overrides or {})
+
+    for _ in range(len(fields) + 1):
+        try:
+            klass.from_dict(values)
+        except ValidationError as e:
+            changed = False
+            for error in e.errors():
+                alias = names.get(error["loc"][0], error["loc"][0])
+                field = fields.get(alias)
+                if field is None or alias in (overrides or {}):
+                    continue
+                allowed = _allowed_values(error["msg"])
+                if allowed is not None:
+                    values[alias] = [allowed[0]] if isinstance(values.get(alias), list) else allowed[0]
+                    changed = True
+                elif not field.required and alias in values:
+                    del values[alias]
+                    changed = True
+            if not changed:
+                return None
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return None
+        else:
+            _samples[key] = values
+            return values
+    return None
+
+
+def _allowed_values(message):
+    """Returns the values in the message of a failed enum validator of a generated model"""
+    for prefix in ("must be one of enum values ", "each list item must be one of "):
+        if message.startswith(prefix):
+            try:
+                allowed = ast.literal_eval(message[len(prefix):])
+            except (ValueError, SyntaxError):
+                return None
+            return allowed if isinstance(allowed, tuple) and allowed else (allowed,)
+    return None
+
+
+def assert_same(actual, expected, path="value"):
+    """Asserts the values are equal and of the same types, all the way down
+
+    Models compare equal to models of other types with the same fields, and str enums
+    to their values, so == alone doesn't show a field which wasn't converted.
+    """
+    assert type(actual) is type(expected), f"{path}: {type(actual)} is not {type(expected)}"
+    if isinstance(expected, BaseModel):
+        for name in expected.__fields__:
+            assert_same(getattr(actual, name), getattr(expected, name), f"{path}.{name}")
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected), path
+        for i, (a, e) in enumerate(zip(actual, expected)):
+            assert_same(a, e, f"{path}[{i}]")
+    elif isinstance(expected, dict):
+        assert actual.keys() == expected.keys(), path
+        for k in expected:
+            assert_same(actual[k], expected[k], f"{path}[{k!r}]")
+    else:
+        assert actual == expected, path
@@ -8,7 +8,10 @@ from TO_BE_REPLACED.configuration import Configuration
 from unittest.mock import MagicMock, patch
 from TO_BE_REPLACED.TEST_API_MODULE import TEST_API as TestApi
 from TO_BE_REPLACED.extensions.api_configuration import ApiConfiguration
+from TO_BE_REPLACED.extensions.connection_pool import ConnectionPoolPolicy
+from TO_BE_REPLACED.extensions.http2_rest import Http2RESTClientObject
 from TO_BE_REPLACED.extensions.socket_keep_alive import keep_alive_socket_options
+from TO_BE_REPLACED.json_codec import JsonCodec, OrjsonCodec
 from TO_BE_REPLACED.extensions.tcp_keep_alive_connector import (
     TCPKeepAliveHTTPSConnectionPool,
     TCPKeepAliveHTTPConnectionPool,
@@ -117,13 +120,41 @@ class TestSyncApiClientFactory:
             id_provider_response_handler=None,
             opts=None,
         )
-        assert (
-            {
-                "http": TCPKeepAliveHTTPConnectionPool,
-                "https": TCPKeepAliveHTTPSConnectionPool,
-            }
-            == instance.api_client.rest_client.rest_object.pool_manager.pool_classes_by_scheme
-        )
+        # the pool classes are subclassed to follow the factory's ConnectionPoolPolicy
+        pool_classes_by_scheme = instance.api_client.rest_client.rest_object.pool_manager.pool_classes_by_scheme
+        assert issubclass(pool_classes_by_scheme["http"], TCPKeepAliveHTTPConnectionPool)
+        assert issubclass(pool_classes_by_scheme["https"], TCPKeepAliveHTTPSConnectionPool)
+
+    def test_connection_pool_stats_are_those_of_the_pool_policy(self):
+        api_client_config_mock = MagicMock(spec=ApiConfiguration)
+        api_client_config_mock.build_api_client_config.return_value = Configuration()
+        pool_policy = ConnectionPoolPolicy(max_connections=32)
+        with patch(
+            "TO_BE_REPLACED.extensions.api_client_factory.get_api_configuration"
+        ) as get_api_configuration_mock:
+            get_api_configuration_mock.return_value = api_client_config_mock
+            api_client_factory = SyncApiClientFactory(config_loaders=[], pool_policy=pool_policy)
+        instance = api_client_factory.build(TestApi)
+        pool_manager = instance.api_client.rest_client.rest_object.pool_manager
+        assert pool_manager.connection_pool_kw["maxsize"] == 32
+        assert pool_manager.connection_pool_kw["block"] is False
+        assert api_client_factory.connection_pool_stats is pool_policy.stats
+
+    def test_json_codec_is_the_json_module_unless_one_is_asked_for(self):
+        pytest.importorskip("orjson")
+        api_client_config_mock = MagicMock(spec=ApiConfiguration)
+        api_client_config_mock.build_api_client_config.side_effect = lambda **kwargs: Configuration()
+        with patch(
+            "TO_BE_REPLACED.extensions.api_client_factory.get_api_configuration"
+        ) as get_api_configuration_mock:
+            get_api_configuration_mock.return_value = api_client_config_mock
+            default_factory = SyncApiClientFactory(config_loaders=[])
+            orjson_factory = SyncApiClientFactory(config_loaders=[], json_codec="orjson")
+        default_client = default_factory.build(TestApi).api_client
+        orjson_client = orjson_factory.build(TestApi).api_client
+        assert type(default_client.configuration.json_codec) is JsonCodec
+        assert isinstance(orjson_client.configuration.json_codec, OrjsonCodec)
+        assert orjson_client.rest_client.rest_object.json_codec is orjson_client.configuration.json_codec
 
 
 class TestAsyncApiClientFactory:
@@ -148,6 +179,7 @@ class TestAsyncApiClientFactory:
             socket_options=keep_alive_socket_options(),
             id_provider_response_handler=None,
             opts=None,
+            is_async=True,
         )
         args, kwargs = set_additional_api_client_headers_mock.call_args
         assert isinstance(args[0], AsyncApiClient)
@@ -155,6 +187,40 @@ class TestAsyncApiClientFactory:
         assert kwargs.get("correlation_id") is None
         assert isinstance(instance.api_client, AsyncApiClient)
 
+    @pytest.mark.asyncio
+    async def test_build_with_http2_uses_http2_rest_client(self):
+        pytest.importorskip("httpx")
+        pytest.importorskip("h2")
+        api_client_config_mock = MagicMock(spec=ApiConfiguration)
+        api_client_config_mock.build_api_client_config.return_value = Configuration()
+        with patch(
+            "TO_BE_REPLACED.extensions.api_client_factory.get_api_configuration"
+        ) as get_api_configuration_mock:
+            get_api_configuration_mock.return_value = api_client_config_mock
+            api_client_factory = ApiClientFactory(config_loaders=[], http2=True)
+        async with api_client_factory:
+            instance = api_client_factory.build(TestApi)
+            assert isinstance(instance.api_client.rest_client.rest_object, Http2RESTClientObject)
+
+    @pytest.mark.asyncio
+    async def test_build_with_json_codec_uses_the_codec(self):
+        pytest.importorskip("orjson")
+        api_client_config_mock = MagicMock(spec=ApiConfiguration)
+        api_client_config_mock.build_api_client_config.return_value = Configuration()
+        with patch(
+            "TO_BE_REPLACED.extensions.api_client_factory.get_api_configuration"
+        ) as get_api_configuration_mock:
+            get_api_configuration_mock.return_value = api_client_config_mock
+            api_client_factory = ApiClientFactory(config_loaders=[], json_codec="orjson")
+        async with api_client_factory:
+            api_client = api_client_factory.build(TestApi).api_client
+            assert isinstance(api_client.configuration.json_codec, OrjsonCodec)
+            assert api_client.rest_client.rest_object.json_codec is api_client.configuration.json_codec
+
+    def test_build_with_http2_and_client_session_raises(self):
+        with pytest.raises(ValueError):
+            ApiClientFactory(config_loaders=[], http2=True, client_session=MagicMock(spec=ClientSession))
+
     @pytest.mark.asyncio
     async def test_build_with_client_session_and_tcp_keep_alive_True_uses_TcpKeepAliveConnector(
         self,
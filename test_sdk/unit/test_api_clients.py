@@ -2,8 +2,10 @@ from TO_BE_REPLACED.extensions.api_client import SyncApiClient
 from TO_BE_REPLACED.configuration import Configuration
 from TO_BE_REPLACED.api_client import ApiClient as AsyncApiClient
 import pytest
+import pytest_asyncio
 from unittest.mock import MagicMock, patch
 from asyncio import Future
+from datetime import date
 
 
 @pytest.mark.asyncio
@@ -51,3 +53,54 @@ def test_sync_api_client_encodes_query_params_correctly():
         args, kwargs = mock_request_function.call_args
         print(args)
         assert expected_encoded_url == args[1]
+
+
+
+@pytest_asyncio.fixture(params=(SyncApiClient, AsyncApiClient))
+async def api_client(request):
+    return request.param(Configuration())
+
+
+@pytest.mark.asyncio
+async def test_api_client_deserializes_nested_type_strings(api_client):
+    response = MagicMock()
+    response.data = '[{"a": "1", "b": null}, null]'
+    result = api_client.deserialize(response, "List[Dict[str, int]]")
+    assert result == [{"a": 1, "b": None}, None]
+
+
+@pytest.mark.asyncio
+async def test_api_client_compiles_each_type_string_once(api_client):
+    response = MagicMock()
+    response.data = '[{"a": "2024-01-01"}, {"b": "2024-01-02"}]'
+    api_client.deserialize(response, "List[Dict[str, date]]")
+    with patch("re.match") as mock_match:
+        result = api_client.deserialize(response, "List[Dict[str, date]]")
+    mock_match.assert_not_called()
+    assert result == [{"a": date(2024, 1, 1)}, {"b": date(2024, 1, 2)}]
+    assert api_client.get_deserializer("List[Dict[str, date]]") is api_client.get_deserializer("List[Dict[str, date]]")
+
+
+class TrustedModel:
+    from_dict = MagicMock(name="from_dict")
+    from_trusted_dict = MagicMock(name="from_trusted_dict")
+
+
+@pytest.mark.asyncio
+async def test_api_client_validates_response_models_by_default(api_client):
+    TrustedModel.from_dict.reset_mock()
+    TrustedModel.from_trusted_dict.reset_mock()
+    api_client.get_deserializer(TrustedModel)({"a": 1})
+    TrustedModel.from_dict.assert_called_once_with({"a": 1})
+    TrustedModel.from_trusted_dict.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_api_client_builds_trusted_response_models_if_not_validating(api_client):
+    TrustedModel.from_dict.reset_mock()
+    TrustedModel.from_trusted_dict.reset_mock()
+    deserialize = api_client.get_deserializer(TrustedModel)
+    api_client.validate_responses = False
+    deserialize({"a": 1})
+    TrustedModel.from_trusted_dict.assert_called_once_with({"a": 1})
+    TrustedModel.from_dict.assert_not_called()
@@ -0,0 +1,52 @@
+from unittest.mock import MagicMock, patch
+
+from TO_BE_REPLACED.api_response import ApiResponse
+from TO_BE_REPLACED.configuration import Configuration
+from TO_BE_REPLACED.extensions.api_client import SyncApiClient
+
+
+class TestApiResponse:
+    def test_keeps_data_and_raw_data_passed_in(self):
+        response = ApiResponse(status_code=200, headers={}, data={"a": 1}, raw_data='{"a": 1}')
+        assert response.data == {"a": 1}
+        assert response.raw_data == '{"a": 1}'
+        assert response.raw_bytes is None
+
+    def test_decodes_raw_data_on_first_access(self):
+        response = ApiResponse(raw_bytes=memoryview("café".encode("latin-1")), encoding="latin-1")
+        assert response.raw_data == "café"
+        assert response.raw_data is response.raw_data
+
+    def test_deserializes_data_once_on_first_access(self):
+        deserialize = MagicMock(return_value={"a": 1})
+        response = ApiResponse(raw_bytes=b'{"a": 1}', deserialize=deserialize)
+        deserialize.assert_not_called()
+        assert response.data == {"a": 1}
+        assert response.data == {"a": 1}
+        deserialize.assert_called_once_with()
+
+    def test_assigned_data_replaces_deserialized_data(self):
+        deserialize = MagicMock()
+        response = ApiResponse(raw_bytes=b'{"a": 1}', deserialize=deserialize)
+        response.data = {"b": 2}
+        assert response.data == {"b": 2}
+        deserialize.assert_not_called()
+
+
+def test_sync_api_client_decodes_and_deserializes_response_body_when_accessed():
+    api_client = SyncApiClient(Configuration(host="https://example.com"))
+    with patch.object(api_client, "request") as mock_request_function:
+        response_data = mock_request_function.return_value
+        response_data.status = 200
+        response_data.data = '{"a": "1"}'.encode("utf-16")
+        response_data.getheader.return_value = "application/json; charset=utf-16"
+        with patch.object(api_client, "deserialize", return_value={"a": 1}) as mock_deserialize:
+            response = api_client.call_api(
+                "/path",
+                "GET",
+                response_types_map={"200": "Dict[str, int]"},
+            )
+            mock_deserialize.assert_not_called()
+            assert response.raw_data == '{"a": "1"}'
+            assert response.data == {"a": 1}
+        mock_deserialize.assert_called_once_with(response_data, "Dict[str, int]")
@@ -0,0 +1,201 @@
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from TO_BE_REPLACED import ApiClientFactory, SyncApiClientFactory
+from TO_BE_REPLACED.configuration import Configuration
+from TO_BE_REPLACED.extensions.api_configuration import ApiConfiguration
+from TO_BE_REPLACED.extensions.bulk import BulkResult, arun_many, run_many
+from TO_BE_REPLACED.extensions.connection_pool import ConnectionPoolPolicy
+
+
+def square(x, delay=0.0):
+    time.sleep(delay)
+    if x < 0:
+        raise ValueError(f"negative {x}")
+    return x * x
+
+
+class TestRunMany:
+    def test_returns_results_in_order(self):
+        kwargs = [{"x": x, "delay": 0.01 * (5 - x)} for x in range(5)]
+        results = list(run_many(square, kwargs, max_concurrency=5))
+        assert [result.index for result in results] == [0, 1, 2, 3, 4]
+        assert [result.get() for result in results] == [0, 1, 4, 9, 16]
+        assert results[2].kwargs == kwargs[2]
+
+    def test_unordered_returns_results_as_they_complete(self):
+        kwargs = [{"x": 1, "delay": 0.5}, {"x": 2}]
+        results = list(run_many(square, kwargs, max_concurrency=2, ordered=False))
+        assert [result.index for result in results] == [1, 0]
+
+    def test_returns_exceptions_per_item(self):
+        results = list(run_many(square, [{"x": 1}, {"x": -1}, {"x": 2}]))
+        assert [result.ok for result in results] == [True, False, True]
+        assert isinstance(results[1].exception, ValueError)
+        with pytest.raises(ValueError):
+            results[1].get()
+        assert results[2].result == 4
+
+    def test_limits_concurrency(self):
+        lock = threading.Lock()
+        running = []
+        max_running = []
+
+        def call(x):
+            with lock:
+                running.append(x)
+                max_running.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(x)
+            return x
+
+        results = list(run_many(call, ({"x": x} for x in range(30)), max_concurrency=3))
+        assert [result.result for result in results] == list(range(30))
+        assert max(max_running) == 3
+
+    def test_reads_kwargs_lazily(self):
+        read = []
+
+        def kwargs():
+            for x in range(100):
+                read.append(x)
+                yield {"x": x}
+
+        results = run_many(square, kwargs(), max_concurrency=2)
+        assert next(results).result == 0
+        assert len(read) < 100
+        results.close()
+
+    @pytest.mark.parametrize("max_concurrency, error", [(0, ValueError), ("2", TypeError)])
+    def test_validates_max_concurrency(self, max_concurrency, error):
+        with pytest.raises(error):
+            next(run_many(square, [{"x": 1}], max_concurrency=max_concurrency))
+
+    def test_repr(self):
+        assert repr(BulkResult(1, {}, result=2)) == "BulkResult(index=1, result=2)"
+
+
+class TestSyncApiClientFactoryRunMany:
+    @pytest.fixture
+    def factory(self):
+        api_configuration = MagicMock(spec=ApiConfiguration)
+        config = Configuration()
+        config.connection_pool_maxsize = 4
+        api_configuration.build_api_client_config.return_value = config
+        with patch(
+            "TO_BE_REPLACED.extensions.api_client_factory.get_api_configuration",
+            return_value=api_configuration,
+        ):
+            yield SyncApiClientFactory(config_loaders=[])
+
+    @staticmethod
+    def api_client(factory):
+        api = MagicMock()
+        factory.build(api)
+        return api.call_args.args[0]
+
+    def test_runs_method_for_each_kwargs(self, factory):
+        results = factory.run_many(square, [{"x": 2}, {"x": 3}], max_concurrency=2)
+        assert [result.get() for result in results] == [4, 9]
+
+    def test_grows_connection_pool_to_max_concurrency(self, factory):
+        pool_manager = self.api_client(factory).rest_client.rest_object.pool_manager
+        list(factory.run_many(square, [{"x": 2}], max_concurrency=20))
+        assert pool_manager.connection_pool_kw["maxsize"] == 20
+        assert pool_manager.connection_from_host("example.com", 443, "https").pool.maxsize == 20
+
+    def test_does_not_close_connection_pools_in_use(self, factory):
+        pool_manager = self.api_client(factory).rest_client.rest_object.pool_manager
+        pool = pool_manager.connection_from_host("example.com", 443, "https")
+        list(factory.run_many(square, [{"x": 2}], max_concurrency=20))
+        assert pool_manager.connection_from_host("example.com", 443, "https") is pool
+        assert pool.pool is not None
+        assert pool.pool.maxsize == 4
+
+    def test_errors_if_max_concurrency_is_more_than_the_max_connections_of_the_pool_policy(self):
+        api_configuration = MagicMock(spec=ApiConfiguration)
+        api_configuration.build_api_client_config.return_value = Configuration()
+        with patch(
+            "TO_BE_REPLACED.extensions.api_client_factory.get_api_configuration",
+            return_value=api_configuration,
+        ):
+            factory = SyncApiClientFactory(config_loaders=[], pool_policy=ConnectionPoolPolicy(max_connections=4))
+        with pytest.raises(ValueError):
+            factory.run_many(square, [{"x": 2}], max_concurrency=20)
+        assert [result.get() for result in factory.run_many(square, [{"x": 2}], max_concurrency=4)] == [4]
+
+    def test_does_not_shrink_connection_pool(self, factory):
+        pool_manager = self.api_client(factory).rest_client.rest_object.pool_manager
+        list(factory.run_many(square, [{"x": 2}], max_concurrency=2))
+        assert pool_manager.connection_pool_kw["maxsize"] == 4
+
+
+async def async_square(x, delay=0.0):
+    await asyncio.sleep(delay)
+    return square(x)
+
+
+class TestArunMany:
+    @pytest.mark.asyncio
+    async def test_yields_results_as_they_complete(self):
+        kwargs = [{"x": 1, "delay": 0.2}, {"x": 2}, {"x": -1}]
+        results = [result async for result in arun_many(async_square, kwargs, max_concurrency=3)]
+        assert [result.index for result in results][-1] == 0
+        by_index = {result.index: result for result in results}
+        assert by_index[0].result == 1
+        assert by_index[1].result == 4
+        assert isinstance(by_index[2].exception, ValueError)
+
+    @pytest.mark.asyncio
+    async def test_limits_concurrency(self):
+        running = []
+        max_running = []
+
+        async def call(x):
+            running.append(x)
+            max_running.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(x)
+            return x
+
+        results = [result async for result in arun_many(call, ({"x": x} for x in range(30)), max_concurrency=4)]
+        assert sorted(result.result for result in results) == list(range(30))
+        assert max(max_running) == 4
+
+    @pytest.mark.asyncio
+    async def test_cancels_calls_in_progress_when_abandoned(self):
+        cancelled = []
+
+        async def call(x):
+            try:
+                await asyncio.sleep(0 if x == 0 else 10)
+            except asyncio.CancelledError:
+                cancelled.append(x)
+                raise
+            return x
+
+        results = arun_many(call, ({"x": x} for x in range(5)), max_concurrency=3)
+        assert (await results.__anext__()).result == 0
+        await results.aclose()
+        await asyncio.sleep(0)
+        assert sorted(cancelled) == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_api_client_factory_run_many(self):
+        api_configuration = MagicMock(spec=ApiConfiguration)
+        api_configuration.build_api_client_config.return_value = Configuration()
+        with patch(
+            "TO_BE_REPLACED.extensions.api_client_factory.get_api_configuration",
+            return_value=api_configuration,
+        ):
+            factory = ApiClientFactory(config_loaders=[])
+        async with factory:
+            with pytest.raises(ValueError):
+                factory.run_many(async_square, [], max_concurrency=0)
+            results = [result async for result in factory.run_many(async_square, [{"x": 2}, {"x": 3}])]
+        assert sorted(result.get() for result in results) == [4, 9]
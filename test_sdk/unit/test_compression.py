@@ -0,0 +1,29 @@
+import gzip
+
+from TO_BE_REPLACED.compression import compress_request_body
+
+
+def test_does_not_compress_without_min_bytes():
+    body = b"x" * 1000
+    headers = {"Content-Type": "application/json"}
+    assert compress_request_body(body, headers, None) == (body, headers)
+
+
+def test_does_not_compress_bodies_smaller_than_min_bytes():
+    headers = {}
+    assert compress_request_body("small", headers, 6) == ("small", headers)
+
+
+def test_gzips_bodies_of_at_least_min_bytes_without_modifying_the_headers():
+    headers = {"Content-Type": "application/json"}
+    body, sent_headers = compress_request_body('{"a": "é"}', headers, 0)
+    assert gzip.decompress(body) == '{"a": "é"}'.encode("utf-8")
+    assert sent_headers == {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+    assert headers == {"Content-Type": "application/json"}
+
+
+def test_does_not_compress_encoded_bodies_or_other_objects():
+    body = gzip.compress(b"x" * 1000)
+    headers = {"Content-Encoding": "gzip"}
+    assert compress_request_body(body, headers, 0) == (body, headers)
+    assert compress_request_body({"a": 1}, {}, 0) == ({"a": 1}, {})
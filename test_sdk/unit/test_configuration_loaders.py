@@ -277,6 +277,14 @@ class TestFileConfigurationLoader:
             config = config_loader.load_config()
             assert "sample_token" == config["access_token"]
 
+    def test_load_config_returns_access_token_which_does_not_watch_the_file(self):
+        with mock.patch("builtins.open", mock.mock_open(read_data="sample_token")), mock.patch(
+            "TO_BE_REPLACED.extensions.file_access_token.InotifyWatcher"
+        ) as watcher:
+            config_loader = FileTokenConfigurationLoader(access_token_location="test_file")
+            assert "sample_token" == config_loader.load_config()["access_token"]
+        watcher.assert_not_called()
+
     def test_load_config_returns_no_access_token_when_location_is_empty_string(self):
         config_loader = FileTokenConfigurationLoader(access_token_location="")
         config = config_loader.load_config()
@@ -61,4 +61,46 @@ def test_correctly_sets_values():
     assert opts.total_timeout_ms == 3001
     assert opts.connect_timeout_ms == 2001
     assert opts.rate_limit_retries == 1001
-    assert opts.read_timeout_ms == 4
\ No newline at end of file
+    assert opts.read_timeout_ms == 4
+
+def test_errors_if_invalid_retry_backoff_type():
+    opts = ConfigurationOptions()
+    with pytest.raises(TypeError) as e:
+        opts.retry_backoff_base_ms = "not-an-int"
+    assert str(e.value) == "retry_backoff_base_ms must be type int but type '<class 'str'>' used"
+
+def test_errors_if_invalid_retry_budget_percent_value():
+    opts = ConfigurationOptions()
+    with pytest.raises(ValueError) as e:
+        opts.retry_budget_percent = -1
+    assert str(e.value) == "retry_budget_percent must be an integer greater than or equal to zero"
+
+def test_correctly_sets_retry_values():
+    opts = ConfigurationOptions(
+        retry_backoff_base_ms=50,
+        retry_backoff_max_ms=5000,
+        retry_budget_percent=10
+    )
+    assert opts.retry_backoff_base_ms == 50
+    assert opts.retry_backoff_max_ms == 5000
+    assert opts.retry_budget_percent == 10
+
+def test_errors_if_invalid_accept_compressed_responses_type():
+    opts = ConfigurationOptions()
+    with pytest.raises(TypeError) as e:
+        opts.accept_compressed_responses = "yes"
+    assert str(e.value) == "accept_compressed_responses must be type bool but type '<class 'str'>' used"
+
+def test_errors_if_invalid_request_compression_min_bytes_value():
+    opts = ConfigurationOptions()
+    with pytest.raises(ValueError) as e:
+        opts.request_compression_min_bytes = -1
+    assert str(e.value) == "request_compression_min_bytes must be an integer greater than or equal to zero"
+
+def test_correctly_sets_compression_values():
+    opts = ConfigurationOptions(
+        accept_compressed_responses=False,
+        request_compression_min_bytes=65536
+    )
+    assert opts.accept_compressed_responses is False
+    assert opts.request_compression_min_bytes == 65536
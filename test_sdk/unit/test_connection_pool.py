@@ -0,0 +1,156 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import urllib3
+
+from TO_BE_REPLACED.extensions.connection_pool import ConnectionPoolPolicy
+from TO_BE_REPLACED.extensions.tcp_keep_alive_connector import (
+    TCPKeepAliveHTTPConnectionPool,
+    TCPKeepAliveHTTPSConnectionPool,
+)
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_counts_created_and_reused_connections(server_url):
+    policy = ConnectionPoolPolicy()
+    pool_manager = urllib3.PoolManager()
+    policy.apply(pool_manager)
+    for _ in range(3):
+        assert pool_manager.request("GET", server_url).status == 200
+    assert policy.stats.as_dict() == {"created": 1, "reused": 2, "discarded": 0, "evicted": 0}
+
+
+def test_evicts_idle_connections(server_url):
+    policy = ConnectionPoolPolicy(idle_timeout_s=0.01)
+    pool_manager = urllib3.PoolManager()
+    policy.apply(pool_manager)
+    pool_manager.request("GET", server_url)
+    time.sleep(0.05)
+    pool_manager.request("GET", server_url)
+    assert policy.stats.as_dict() == {"created": 2, "reused": 0, "discarded": 0, "evicted": 1}
+
+
+def test_counts_connections_discarded_from_a_full_pool():
+    policy = ConnectionPoolPolicy(max_connections=1, block=False)
+    pool_manager = urllib3.PoolManager()
+    policy.apply(pool_manager)
+    pool = pool_manager.connection_from_host("127.0.0.1", 1, "http")
+    connections = [pool._get_conn(), pool._get_conn()]
+    for conn in connections:
+        pool._put_conn(conn)
+    assert policy.stats.discarded == 1
+    assert policy.stats.created == 2
+
+
+def test_waits_for_a_connection_from_an_exhausted_pool_up_to_the_pool_timeout():
+    policy = ConnectionPoolPolicy(max_connections=1, block=True, pool_timeout_s=0.1)
+    pool_manager = urllib3.PoolManager()
+    policy.apply(pool_manager)
+    pool = pool_manager.connection_from_host("127.0.0.1", 1, "http")
+    # a connection which is never returned, e.g. by a streamed response which isn't read
+    conn = pool._get_conn()
+    start = time.monotonic()
+    with pytest.raises(urllib3.exceptions.EmptyPoolError):
+        pool._get_conn()
+    assert 0.1 <= time.monotonic() - start < 5
+    # the connection can be used again once it's returned
+    pool._put_conn(conn)
+    assert pool._get_conn() is conn
+
+
+def test_requests_to_an_exhausted_pool_fail_after_the_pool_timeout(server_url):
+    policy = ConnectionPoolPolicy(max_connections=1, block=True, pool_timeout_s=0.1)
+    pool_manager = urllib3.PoolManager()
+    policy.apply(pool_manager)
+    response = pool_manager.request("GET", server_url, preload_content=False)
+    with pytest.raises(urllib3.exceptions.EmptyPoolError):
+        pool_manager.request("GET", server_url, retries=False)
+    response.read()
+    response.release_conn()
+    assert pool_manager.request("GET", server_url).status == 200
+
+
+def test_applies_pool_size_and_blocking_to_the_pool_manager():
+    pool_manager = urllib3.PoolManager(maxsize=4)
+    ConnectionPoolPolicy(max_connections=32, block=True).apply(pool_manager)
+    pool = pool_manager.connection_from_host("example.com", 443, "https")
+    assert pool.pool.maxsize == 32
+    assert pool.block is True
+
+
+def test_does_not_block_by_default():
+    pool_manager = urllib3.PoolManager()
+    ConnectionPoolPolicy().apply(pool_manager)
+    assert pool_manager.connection_from_host("example.com", 443, "https").block is False
+
+
+def test_grows_the_pools_to_ensure_max_connections():
+    pool_manager = urllib3.PoolManager(maxsize=4)
+    policy = ConnectionPoolPolicy()
+    policy.apply(pool_manager)
+    policy.ensure_max_connections(pool_manager, 20)
+    policy.ensure_max_connections(pool_manager, 2)
+    assert pool_manager.connection_from_host("example.com", 443, "https").pool.maxsize == 20
+
+
+def test_does_not_replace_pools_in_use_to_ensure_max_connections():
+    pool_manager = urllib3.PoolManager(maxsize=4)
+    policy = ConnectionPoolPolicy()
+    policy.apply(pool_manager)
+    pool = pool_manager.connection_from_host("example.com", 443, "https")
+    conn = pool._get_conn()
+    policy.ensure_max_connections(pool_manager, 20)
+    assert pool_manager.connection_from_host("example.com", 443, "https") is pool
+    pool._put_conn(conn)
+    assert pool._get_conn() is conn
+
+
+def test_does_not_ensure_more_than_the_max_connections_of_the_policy():
+    pool_manager = urllib3.PoolManager()
+    policy = ConnectionPoolPolicy(max_connections=4)
+    policy.apply(pool_manager)
+    policy.ensure_max_connections(pool_manager, 4)
+    with pytest.raises(ValueError):
+        policy.ensure_max_connections(pool_manager, 5)
+    assert pool_manager.connection_pool_kw["maxsize"] == 4
+
+
+def test_keeps_the_pool_classes_of_the_pool_manager():
+    policy = ConnectionPoolPolicy()
+    pool_manager = urllib3.PoolManager()
+    pool_manager.pool_classes_by_scheme = {"http": TCPKeepAliveHTTPConnectionPool, "https": TCPKeepAliveHTTPSConnectionPool}
+    policy.apply(pool_manager)
+    policy.apply(pool_manager)
+    assert issubclass(pool_manager.pool_classes_by_scheme["http"], TCPKeepAliveHTTPConnectionPool)
+    assert issubclass(pool_manager.pool_classes_by_scheme["https"], TCPKeepAliveHTTPSConnectionPool)
+    assert pool_manager.pool_classes_by_scheme["https"].__bases__[-1] is TCPKeepAliveHTTPSConnectionPool
+
+
+@pytest.mark.parametrize("kwargs", [{"max_connections": 0}, {"pool_timeout_s": 0}, {"idle_timeout_s": 0}])
+def test_errors_if_invalid_values(kwargs):
+    with pytest.raises(ValueError):
+        ConnectionPoolPolicy(**kwargs)
@@ -0,0 +1,49 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from dateutil.parser import parse
+
+from TO_BE_REPLACED.datetime_parsing import parse_date, parse_datetime
+
+
+class TestParseDatetime:
+    @pytest.mark.parametrize("string", [
+        "2024-01-02T03:04:05.1234567Z",
+        "2024-01-02T03:04:05.123Z",
+        "2024-01-02T03:04:05Z",
+        "2024-01-02T03:04:05.5+01:00",
+        "2024-01-02T03:04:05-0530",
+        "2024-01-02T03:04:05+01",
+        "2024-01-02T03:04",
+        "2024-01-02 03:04:05",
+        "2024-01-02",
+        "0001-01-01T00:00:00.0000000+00:00",
+        "9999-12-31T23:59:59.9999999+00:00",
+    ])
+    def test_matches_dateutil(self, string):
+        assert parse_datetime(string) == parse(string)
+        assert parse_datetime(string).utcoffset() == parse(string).utcoffset()
+
+    def test_parses_lusid_timestamps(self):
+        assert parse_datetime("2024-01-02T03:04:05.1234567Z") == datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc)
+        assert parse_datetime("2024-01-02T03:04:05.5-05:00").utcoffset() == timedelta(hours=-5)
+
+    def test_falls_back_to_dateutil(self):
+        assert parse_datetime("2 January 2024 3:04am") == datetime(2024, 1, 2, 3, 4)
+
+    def test_raises_value_error_if_not_a_datetime(self):
+        with pytest.raises(ValueError):
+            parse_datetime("not a datetime")
+
+    def test_caches_parsed_values(self):
+        parse_datetime.cache_clear()
+        assert parse_datetime("2024-05-06T07:08:09Z") is parse_datetime("2024-05-06T07:08:09Z")
+        assert parse_datetime.cache_info().hits == 1
+
+
+class TestParseDate:
+    def test_parses_dates(self):
+        assert parse_date("2024-01-02") == date(2024, 1, 2)
+
+    def test_parses_date_of_datetime(self):
+        assert parse_date("2024-01-02T23:04:05.1234567Z") == date(2024, 1, 2)
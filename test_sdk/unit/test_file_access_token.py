@@ -1,7 +1,13 @@
 from TO_BE_REPLACED.extensions.file_access_token import FileAccessToken
 from unittest import mock
+import gc
+import os
+import sys
+import threading
 import time
 
+import pytest
+
 class TestFileAccessToken:
     def test_file_access_token_loads_token_from_file(self):
         with mock.patch(
@@ -23,3 +29,155 @@ class TestFileAccessToken:
             assert "token1" == token
             time.sleep(3)
             assert "token2" == token
+
+
+class TestWatchedFileAccessToken:
+    @staticmethod
+    def wait_for(token, expected):
+        for _ in range(50):
+            if str(token) == expected:
+                return True
+            time.sleep(0.1)
+        return False
+
+    @staticmethod
+    def replace(path, content):
+        # written then renamed into place, as secrets are usually updated
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as token_file:
+            token_file.write(content)
+        os.replace(temp_path, path)
+
+    def test_reloads_token_when_file_changes(self, tmp_path):
+        path = str(tmp_path / "token")
+        self.replace(path, "token1")
+        token = FileAccessToken(access_token_location=path, watch=True)
+        assert "token1" == token
+        self.replace(path, "token2")
+        assert self.wait_for(token, "token2")
+
+    def test_does_not_reread_unchanged_file(self, tmp_path):
+        path = str(tmp_path / "token")
+        self.replace(path, "token1")
+        token = FileAccessToken(access_token_location=path, watch=True, poll_interval=0)
+        assert "token1" == token
+        with mock.patch("builtins.open") as mock_open:
+            for _ in range(10):
+                assert "token1" == token
+            mock_open.assert_not_called()
+
+    def test_polls_file_when_inotify_is_not_available(self, tmp_path):
+        path = str(tmp_path / "token")
+        self.replace(path, "token1")
+        with mock.patch(
+            "TO_BE_REPLACED.extensions.file_access_token.InotifyWatcher", side_effect=OSError("not available")
+        ):
+            token = FileAccessToken(access_token_location=path, watch=True, poll_interval=0)
+            assert "token1" == token
+            with mock.patch("builtins.open", wraps=open) as mock_open:
+                assert "token1" == token
+                mock_open.assert_not_called()
+            self.replace(path, "token22")
+            assert "token22" == token
+
+    def test_raises_when_file_is_missing(self, tmp_path):
+        token = FileAccessToken(access_token_location=str(tmp_path / "missing"), watch=True)
+        with pytest.raises(OSError):
+            str(token)
+
+    def test_ignores_changes_to_other_files_in_the_directory(self, tmp_path):
+        path = str(tmp_path / "token")
+        self.replace(path, "token1")
+        token = FileAccessToken(access_token_location=path, watch=True)
+        assert "token1" == token
+        for i in range(5):
+            self.replace(str(tmp_path / "other"), f"other{i}")
+        time.sleep(0.5)
+        with mock.patch("builtins.open") as mock_open:
+            assert "token1" == token
+            mock_open.assert_not_called()
+        self.replace(path, "token2")
+        assert self.wait_for(token, "token2")
+
+    def test_reloads_token_when_kubernetes_secret_is_updated(self, tmp_path):
+        # the secret's files are links through ..data, which is replaced to update them
+        for version in ("v1", "v2"):
+            os.mkdir(tmp_path / version)
+            (tmp_path / version / "token").write_text(f"token-{version}")
+        os.symlink("v1", tmp_path / "..data")
+        os.symlink(os.path.join("..data", "token"), tmp_path / "token")
+        token = FileAccessToken(access_token_location=str(tmp_path / "token"), watch=True)
+        assert "token-v1" == token
+        os.symlink("v2", tmp_path / "..data_tmp")
+        os.replace(tmp_path / "..data_tmp", tmp_path / "..data")
+        assert self.wait_for(token, "token-v2")
+
+    def test_rereads_token_after_expiry_time_when_changes_are_not_seen(self, tmp_path):
+        # changes to the target of an absolute symlink aren't seen by watching its directory
+        os.mkdir(tmp_path / "secrets")
+        self.replace(str(tmp_path / "secrets" / "token"), "token1")
+        os.symlink(tmp_path / "secrets" / "token", tmp_path / "token")
+        token = FileAccessToken(access_token_location=str(tmp_path / "token"), expiry_time=1, watch=True)
+        assert "token1" == token
+        self.replace(str(tmp_path / "secrets" / "token"), "token2")
+        assert self.wait_for(token, "token2")
+
+    def test_starts_watching_once_when_read_concurrently(self, tmp_path):
+        path = str(tmp_path / "token")
+        self.replace(path, "token1")
+
+        def start_watching(*args):
+            time.sleep(0.1)
+            return mock.MagicMock()
+
+        with mock.patch(
+            "TO_BE_REPLACED.extensions.file_access_token.InotifyWatcher", side_effect=start_watching
+        ) as watcher:
+            token = FileAccessToken(access_token_location=path, watch=True)
+            threads = [threading.Thread(target=str, args=(token,)) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert watcher.call_count == 1
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is only available on linux")
+class TestInotifyWatcher:
+    @staticmethod
+    def open_fds():
+        return len(os.listdir("/proc/self/fd"))
+
+    @staticmethod
+    def watcher_threads():
+        return [thread for thread in threading.enumerate() if thread.name == "FileAccessToken"]
+
+    def wait_for_release(self, fds, threads):
+        for _ in range(50):
+            if self.open_fds() <= fds and len(self.watcher_threads()) <= threads:
+                return True
+            time.sleep(0.1)
+        return False
+
+    def test_close_releases_the_watch(self, tmp_path):
+        path = tmp_path / "token"
+        path.write_text("token1")
+        fds, threads = self.open_fds(), len(self.watcher_threads())
+        token = FileAccessToken(access_token_location=str(path), watch=True)
+        assert "token1" == token
+        assert len(self.watcher_threads()) == threads + 1
+        token.close()
+        assert self.wait_for_release(fds, threads)
+        # the file is polled instead
+        path.write_text("token22")
+        assert TestWatchedFileAccessToken.wait_for(token, "token22")
+
+    def test_releases_the_watch_of_a_garbage_collected_token(self, tmp_path):
+        path = tmp_path / "token"
+        path.write_text("token1")
+        fds, threads = self.open_fds(), len(self.watcher_threads())
+        token = FileAccessToken(access_token_location=str(path), watch=True)
+        assert "token1" == token
+        del token
+        gc.collect()
+        assert self.wait_for_release(fds, threads)
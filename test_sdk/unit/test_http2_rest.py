@@ -0,0 +1,95 @@
+import gzip
+import json
+
+import pytest
+
+from TO_BE_REPLACED.configuration import Configuration
+from TO_BE_REPLACED.exceptions import ApiException
+from TO_BE_REPLACED.extensions.configuration_options import ConfigurationOptions
+from TO_BE_REPLACED.extensions.http2_rest import Http2RESTClientObject
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("h2")
+
+
+def rest_client_for(handler, **kwargs):
+    rest_client = Http2RESTClientObject(Configuration(**kwargs))
+    rest_client.pool_manager = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return rest_client
+
+
+class TestHttp2RESTClientObject:
+    @pytest.mark.asyncio
+    async def test_sends_json_body_and_reads_response(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"id": 1}, headers={"X-Test": "1"})
+
+        rest_client = rest_client_for(handler, request_compression_min_bytes=10)
+        response = await rest_client.post_request("https://www.lusid.com/api/things", body=b'{"name": "large enough"}')
+        await rest_client.close()
+
+        assert response.status == 200
+        assert json.loads(response.data) == {"id": 1}
+        assert response.getheader("x-test") == "1"
+        assert requests[0].headers["Content-Type"] == "application/json"
+        assert requests[0].headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(requests[0].content) == b'{"name": "large enough"}'
+
+    @pytest.mark.asyncio
+    async def test_raises_api_exception_for_error_statuses(self):
+        rest_client = rest_client_for(lambda request: httpx.Response(404, content=b"missing"))
+        with pytest.raises(ApiException) as e:
+            await rest_client.get_request("https://www.lusid.com/api/things")
+        await rest_client.close()
+        assert e.value.status == 404
+        assert e.value.body == b"missing"
+
+    @pytest.mark.asyncio
+    async def test_asks_for_uncompressed_responses_if_not_accepting_them(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200)
+
+        rest_client = rest_client_for(handler)
+        opts = ConfigurationOptions(accept_compressed_responses=False)
+        await rest_client.get_request("https://www.lusid.com/api/things", opts=opts)
+        await rest_client.close()
+        assert requests[0].headers["Accept-Encoding"] == "identity"
+
+    @pytest.mark.asyncio
+    async def test_streams_response_body_if_not_preloading(self):
+        rest_client = rest_client_for(lambda request: httpx.Response(200, content=b'{"values": [1, 2]}'))
+        response = await rest_client.get_request("https://www.lusid.com/api/things", _preload_content=False)
+        chunks = [chunk async for chunk in response.content.iter_chunked(4)]
+        response.release()
+        await rest_client.close()
+        assert response.status == 200
+        assert b"".join(chunks) == b'{"values": [1, 2]}'
+
+    @pytest.mark.asyncio
+    async def test_raises_api_exception_for_error_statuses_if_not_preloading(self):
+        rest_client = rest_client_for(lambda request: httpx.Response(503, content=b"unavailable"))
+        with pytest.raises(ApiException) as e:
+            await rest_client.get_request("https://www.lusid.com/api/things", _preload_content=False)
+        await rest_client.close()
+        assert e.value.status == 503
+        assert e.value.body == b"unavailable"
+
+    @pytest.mark.asyncio
+    async def test_applies_timeouts_from_configuration_and_opts(self):
+        timeouts = []
+
+        def handler(request):
+            timeouts.append(request.extensions["timeout"])
+            return httpx.Response(200)
+
+        rest_client = rest_client_for(handler)
+        await rest_client.get_request("https://www.lusid.com/api/things", opts=ConfigurationOptions(connect_timeout_ms=2000))
+        await rest_client.close()
+        assert timeouts[0]["connect"] == 2.0
+        assert timeouts[0]["read"] is None
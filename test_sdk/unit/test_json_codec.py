@@ -0,0 +1,109 @@
+from datetime import date
+from unittest.mock import MagicMock
+import pytest
+import urllib3
+from TO_BE_REPLACED.configuration import Configuration
+from TO_BE_REPLACED.extensions.api_client import SyncApiClient
+from TO_BE_REPLACED.extensions.rest import RESTClientObject
+from TO_BE_REPLACED.json_codec import (
+    JsonCodec,
+    OrjsonCodec,
+    get_json_codec,
+)
+
+
+class TestJsonCodec:
+    def test_get_json_codec_by_name(self):
+        assert type(get_json_codec("json")) is JsonCodec
+
+    def test_get_json_codec_errors_if_unknown_name(self):
+        with pytest.raises(ValueError) as e:
+            get_json_codec("not-a-codec")
+        assert str(e.value) == "unknown json codec 'not-a-codec', must be one of ['json', 'orjson', 'ujson']"
+
+    def test_get_json_codec_defaults_to_the_json_module_even_if_orjson_is_installed(self):
+        # orjson doesn't round trip large integers and NaN as the json module does
+        assert type(get_json_codec()) is JsonCodec
+
+    def test_get_json_codec_returns_orjson_when_asked_for(self):
+        pytest.importorskip("orjson")
+        assert isinstance(get_json_codec("orjson"), OrjsonCodec)
+
+    def test_default_codec_round_trips_large_integers_and_nan(self):
+        codec = get_json_codec()
+        decoded = codec.loads(codec.dumps({"big": 2 ** 70, "nan": float("nan")}))
+        assert decoded["big"] == 2 ** 70
+        assert decoded["nan"] != decoded["nan"]
+
+    @pytest.mark.parametrize("name", ["json", "orjson", "ujson"])
+    def test_codec_round_trips_json_from_bytes(self, name):
+        pytest.importorskip(name)
+        codec = get_json_codec(name)
+        obj = {"scope": "test", "values": [1, 2.5, None, True], "name": "café"}
+        encoded = codec.dumps(obj)
+        if isinstance(encoded, str):
+            encoded = encoded.encode("utf-8")
+        assert codec.loads(encoded) == obj
+
+    def test_configuration_uses_default_codec(self):
+        assert type(Configuration().json_codec) is JsonCodec
+
+
+class TestApiClientJsonCodec:
+    @staticmethod
+    def response(data, content_type=None):
+        response = MagicMock()
+        response.data = data
+        response.getheader.return_value = content_type
+        return response
+
+    def test_deserialize_parses_bytes_with_configured_codec(self):
+        config = Configuration()
+        config.json_codec = MagicMock(wraps=JsonCodec())
+        api_client = SyncApiClient(config)
+        result = api_client.deserialize(self.response(b'{"a": "1"}'), "Dict[str, int]")
+        assert result == {"a": 1}
+        config.json_codec.loads.assert_called_once_with(b'{"a": "1"}')
+
+    def test_deserialize_decodes_bytes_with_non_utf8_charset(self):
+        api_client = SyncApiClient(Configuration())
+        response = self.response('{"a": "café"}'.encode("latin-1"), "application/json; charset=latin-1")
+        assert api_client.deserialize(response, "Dict[str, str]") == {"a": "café"}
+
+    def test_deserialize_returns_str_if_body_is_not_json(self):
+        api_client = SyncApiClient(Configuration())
+        assert api_client.deserialize(self.response(b"plain text"), "str") == "plain text"
+
+
+class TestRestJsonCodec:
+    def test_sync_request_encodes_body_with_configured_codec(self):
+        config = Configuration()
+        config.json_codec = MagicMock(wraps=JsonCodec())
+        rest_client = RESTClientObject(config)
+        rest_client.pool_manager = MagicMock()
+        rest_client.pool_manager.request.return_value = urllib3.response.HTTPResponse(body="response", status=200)
+        rest_client.request("POST", "https://www.lusid.com/api", body={"a": 1}, _preload_content=False)
+        config.json_codec.dumps.assert_called_once_with({"a": 1})
+        args, kwargs = rest_client.pool_manager.request.call_args
+        assert kwargs["body"] == '{"a": 1}'
+
+    def test_sync_request_sends_encoded_body_as_is(self):
+        config = Configuration()
+        config.json_codec = MagicMock(wraps=JsonCodec())
+        rest_client = RESTClientObject(config)
+        rest_client.pool_manager = MagicMock()
+        rest_client.pool_manager.request.return_value = urllib3.response.HTTPResponse(body="response", status=200)
+        rest_client.request("POST", "https://www.lusid.com/api", body=b'{"a": 1}', _preload_content=False)
+        config.json_codec.dumps.assert_not_called()
+        args, kwargs = rest_client.pool_manager.request.call_args
+        assert kwargs["body"] == b'{"a": 1}'
+
+    def test_api_client_encodes_json_body_to_bytes(self):
+        config = Configuration(host="https://www.lusid.com")
+        config.json_codec = JsonCodec()
+        api_client = SyncApiClient(config)
+        api_client.rest_client = MagicMock()
+        api_client.call_api("/api", "POST", header_params={"Content-Type": "application/json"},
+                            body={"name": "café", "on": date(2024, 1, 2)}, _preload_content=False)
+        args, kwargs = api_client.rest_client.post_request.call_args
+        assert kwargs["body"] == b'{"name": "caf\\u00e9", "on": "2024-01-02"}'
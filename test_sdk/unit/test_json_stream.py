@@ -0,0 +1,264 @@
+import gc
+import json
+from typing import List, Optional
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiohttp
+import pytest
+from pydantic.v1 import BaseModel, StrictInt, StrictStr
+
+import TO_BE_REPLACED.models
+from TO_BE_REPLACED.api_client import ApiClient as AsyncApiClient
+from TO_BE_REPLACED.configuration import Configuration
+from TO_BE_REPLACED.exceptions import ApiException, ApiValueError
+from TO_BE_REPLACED.extensions.api_client import SyncApiClient
+from TO_BE_REPLACED.extensions.retry import RetryingRestWrapperAsync
+from TO_BE_REPLACED.json_stream import (
+    JsonArrayStreamParser,
+    aiter_json_array,
+    iter_json_array,
+)
+
+DOCUMENT = {
+    "nextPage": "token",
+    "links": [{"href": "values", "rel": "[values]"}],
+    "values": [{"id": 1, "name": "é"}, {"id": 22, "name": "}],"}, 333, -4.5e2, "ünïcödé", None, True, []],
+    "href": "https://example.com",
+}
+
+
+def chunked(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestJsonArrayStreamParser:
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 100000])
+    def test_yields_values_for_any_chunking(self, size):
+        data = json.dumps(DOCUMENT, ensure_ascii=False, indent=2).encode("utf-8")
+        assert list(iter_json_array(chunked(data, size))) == DOCUMENT["values"]
+
+    def test_returns_items_as_soon_as_they_are_received(self):
+        parser = JsonArrayStreamParser()
+        assert parser.feed(b'{"values": [{"id": 1}, {"id"') == [{"id": 1}]
+        assert parser.feed(b': 2}, 12') == [{"id": 2}]
+        # the number could continue in the next chunk
+        assert parser.feed(b'3]') == [123]
+        assert parser.feed(b"}") == []
+        parser.close()
+
+    def test_does_not_decode_large_items_from_their_start_on_every_chunk(self):
+        item = {"id": 1, "names": ["name %d" % i for i in range(2000)]}
+        data = json.dumps({"values": [item, 2]}).encode("utf-8")
+        parser = JsonArrayStreamParser()
+        decoder = parser._JsonArrayStreamParser__json_decoder
+        with patch.object(decoder, "raw_decode", wraps=decoder.raw_decode) as raw_decode:
+            items = []
+            for chunk in chunked(data, 10):
+                items += parser.feed(chunk)
+            items += parser.close()
+        assert items == [item, 2]
+        # the item is decoded once each time twice as much of it has been received
+        assert len(data) // 10 > 2000
+        assert raw_decode.call_count < 30
+
+    def test_returns_items_which_were_not_retried_when_closed(self):
+        parser = JsonArrayStreamParser()
+        assert parser.feed(b'{"values": [{"id": 1') == []
+        assert parser.feed(b'}]}') == []
+        assert parser.close() == [{"id": 1}]
+
+    def test_reads_the_array_under_the_given_key(self):
+        data = b'{"values": [1], "items": [2, 3]}'
+        assert list(iter_json_array([data], key="items")) == [2, 3]
+
+    def test_yields_nothing_if_the_key_is_missing(self):
+        assert list(iter_json_array([b'{"href": "values"}'])) == []
+
+    def test_decodes_the_given_encoding(self):
+        data = '{"values": ["ünïcödé"]}'.encode("utf-16")
+        assert list(iter_json_array(chunked(data, 1), encoding="utf-16")) == ["ünïcödé"]
+
+    def test_raises_if_the_document_is_incomplete(self):
+        with pytest.raises(ValueError):
+            list(iter_json_array([b'{"values": [1, 2']))
+
+    def test_raises_if_the_document_is_not_an_object(self):
+        with pytest.raises(ValueError):
+            list(iter_json_array([b"[1, 2]"]))
+
+    def test_raises_if_the_values_are_not_an_array(self):
+        with pytest.raises(ValueError):
+            list(iter_json_array([b'{"values": {"a": 1}}']))
+
+    @pytest.mark.asyncio
+    async def test_async_yields_values(self):
+        async def chunks():
+            for chunk in chunked(json.dumps(DOCUMENT).encode("utf-8"), 5):
+                yield chunk
+
+        assert [item async for item in aiter_json_array(chunks())] == DOCUMENT["values"]
+
+
+class StreamItem(BaseModel):
+    id: StrictInt
+    name: Optional[StrictStr] = None
+
+    @classmethod
+    def from_dict(cls, obj):
+        return cls.parse_obj(obj)
+
+
+class ResourceListOfStreamItem(BaseModel):
+    values: List[StreamItem]
+    href: Optional[StrictStr] = None
+
+
+class ResourceListOfStreamString(BaseModel):
+    values: List[StrictStr]
+
+
+class NotAList(BaseModel):
+    href: Optional[StrictStr] = None
+
+
+@pytest.fixture(autouse=True)
+def stream_models(monkeypatch):
+    for model in (ResourceListOfStreamItem, ResourceListOfStreamString, NotAList):
+        monkeypatch.setattr(TO_BE_REPLACED.models, model.__name__, model, raising=False)
+
+
+BODY = json.dumps({"values": [{"id": 1, "name": "a"}, {"id": 2}], "href": "x"}).encode("utf-8")
+
+
+def sync_response(body):
+    response = MagicMock()
+    response.status = 200
+    response.headers = {"content-type": "application/json; charset=utf-8"}
+    response.stream.side_effect = lambda size: iter(chunked(body, 4))
+    return response
+
+
+def async_response(body):
+    async def iter_chunked(size):
+        for chunk in chunked(body, 4):
+            yield chunk
+
+    response = MagicMock()
+    response.status = 200
+    response.headers = {"content-type": "application/json"}
+    response.content.iter_chunked.side_effect = iter_chunked
+    return response
+
+
+class TestSyncApiClientStream:
+    def call_api(self, response, response_type):
+        api_client = SyncApiClient(Configuration(host="https://example.com"))
+        with patch.object(api_client, "request", return_value=response) as request:
+            result = api_client.call_api(
+                "/path", "GET", response_types_map={"200": response_type},
+                _return_http_data_only=True, _stream=True)
+        assert request.call_args.kwargs["_preload_content"] is False
+        return result
+
+    def test_yields_deserialized_values(self):
+        response = sync_response(BODY)
+        items = self.call_api(response, "ResourceListOfStreamItem")
+        assert list(items) == [StreamItem(id=1, name="a"), StreamItem(id=2)]
+        response.close.assert_not_called()
+        response.release_conn.assert_called_once()
+
+    def test_yields_primitive_values(self):
+        response = sync_response(b'{"values": ["a", "b"]}')
+        assert list(self.call_api(response, "ResourceListOfStreamString")) == ["a", "b"]
+
+    def test_closes_connection_if_not_fully_read(self):
+        response = sync_response(BODY)
+        items = self.call_api(response, "ResourceListOfStreamItem")
+        assert next(items) == StreamItem(id=1, name="a")
+        items.close()
+        response.close.assert_called_once()
+        response.release_conn.assert_called_once()
+
+    def test_releases_connection_if_never_read(self):
+        response = sync_response(BODY)
+        items = self.call_api(response, "ResourceListOfStreamItem")
+        del items
+        gc.collect()
+        response.close.assert_called_once()
+        response.release_conn.assert_called_once()
+
+    def test_releases_connection_when_used_as_a_context_manager(self):
+        response = sync_response(BODY)
+        with self.call_api(response, "ResourceListOfStreamItem") as items:
+            assert next(items) == StreamItem(id=1, name="a")
+        response.close.assert_called_once()
+        response.release_conn.assert_called_once()
+        assert list(items) == []
+
+    def test_raises_if_response_has_no_values(self):
+        response = sync_response(b"{}")
+        with pytest.raises(ApiValueError):
+            self.call_api(response, "NotAList")
+        response.close.assert_called_once()
+        response.release_conn.assert_called_once()
+
+
+class TestAsyncApiClientStream:
+    async def call_api(self, response, response_type):
+        api_client = AsyncApiClient(Configuration(host="https://example.com"))
+        try:
+            with patch.object(api_client, "request", new_callable=AsyncMock, return_value=response) as request:
+                result = await api_client.call_api(
+                    "/path", "GET", response_types_map={"200": response_type},
+                    _return_http_data_only=True, _stream=True)
+        finally:
+            await api_client.close()
+        assert request.call_args.kwargs["_preload_content"] is False
+        return result
+
+    @pytest.mark.asyncio
+    async def test_yields_deserialized_values(self):
+        response = async_response(BODY)
+        items = await self.call_api(response, "ResourceListOfStreamItem")
+        assert [item async for item in items] == [StreamItem(id=1, name="a"), StreamItem(id=2)]
+        response.release.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_raises_if_response_has_no_values(self):
+        response = async_response(b"{}")
+        with pytest.raises(ApiValueError):
+            await self.call_api(response, "NotAList")
+        response.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_retries_error_statuses_before_streaming(self):
+        unavailable = async_response(b"")
+        unavailable.status = 503
+        unavailable.headers = {}
+        unavailable.read = AsyncMock(return_value=b'{"name": "Unavailable"}')
+        response = async_response(BODY)
+        api_client = AsyncApiClient(Configuration(host="https://example.com"))
+        rest_client = api_client.rest_client
+        rest_client.pool_manager = AsyncMock(aiohttp.ClientSession)
+        rest_client.pool_manager.request = AsyncMock(side_effect=[unavailable, response])
+        api_client.rest_client = RetryingRestWrapperAsync(rest_object=rest_client, retry_backoff_base_ms=1)
+        items = await api_client.call_api(
+            "/path", "GET", response_types_map={"200": "ResourceListOfStreamItem"},
+            _return_http_data_only=True, _stream=True)
+        assert [item async for item in items] == [StreamItem(id=1, name="a"), StreamItem(id=2)]
+        assert rest_client.pool_manager.request.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_raises_api_exception_for_error_status(self):
+        not_found = async_response(b"")
+        not_found.status = 404
+        not_found.read = AsyncMock(return_value=b'{"name": "NotFound"}')
+        api_client = AsyncApiClient(Configuration(host="https://example.com"))
+        api_client.rest_client.pool_manager = AsyncMock(aiohttp.ClientSession)
+        api_client.rest_client.pool_manager.request = AsyncMock(return_value=not_found)
+        with pytest.raises(ApiException) as error:
+            await api_client.call_api(
+                "/path", "GET", response_types_map={"200": "ResourceListOfStreamItem"},
+                _return_http_data_only=True, _stream=True)
+        assert error.value.status == 404
+        assert error.value.body == '{"name": "NotFound"}'
@@ -0,0 +1,43 @@
+import importlib
+import sys
+
+import pytest
+
+import TO_BE_REPLACED
+import TO_BE_REPLACED.api
+import TO_BE_REPLACED.models
+from TO_BE_REPLACED.TEST_API_MODULE import TEST_API as TestApi
+
+
+class TestLazyImports:
+    def test_api_can_be_imported_from_package(self):
+        from TO_BE_REPLACED import TEST_API
+        assert TEST_API is TestApi
+
+    def test_api_can_be_imported_from_api_package(self):
+        from TO_BE_REPLACED.api import TEST_API
+        assert TEST_API is TestApi
+
+    def test_all_names_in_package_are_resolvable(self):
+        for name in TO_BE_REPLACED.__all__:
+            assert getattr(TO_BE_REPLACED, name) is not None
+
+    def test_all_names_in_models_package_are_resolvable(self):
+        for name in TO_BE_REPLACED.models.__all__[:10]:
+            assert getattr(TO_BE_REPLACED.models, name) is getattr(TO_BE_REPLACED, name)
+
+    def test_lazy_names_are_listed_by_dir(self):
+        assert "TEST_API" in dir(TO_BE_REPLACED)
+        assert "TEST_API" in dir(TO_BE_REPLACED.api)
+
+    def test_unknown_name_raises_attribute_error(self):
+        with pytest.raises(AttributeError) as e:
+            TO_BE_REPLACED.NotAnApiOrModel
+        assert str(e.value) == "module 'TO_BE_REPLACED' has no attribute 'NotAnApiOrModel'"
+
+    def test_eager_imports_env_var_imports_all_apis(self, monkeypatch):
+        monkeypatch.setenv("FBN_EAGER_IMPORTS", "true")
+        api_package = importlib.reload(TO_BE_REPLACED.api)
+        for name in api_package.__all__:
+            assert name in vars(api_package)
+        assert all(module in sys.modules for module in api_package._LAZY_IMPORTS.values())
@@ -0,0 +1,158 @@
+import pytest
+
+import TO_BE_REPLACED.models
+
+from .model_samples import assert_same, discriminator_map, model_classes, sample_dict
+
+
+def test_from_trusted_dict_builds_the_same_models_as_from_dict():
+    # every model of the sdk which sample data can be built for, including those with
+    # date, datetime and enum fields in lists and dicts, and nested and polymorphic models
+    checked = 0
+    for klass in model_classes():
+        sample = sample_dict(klass)
+        if sample is None:
+            continue
+        trusted = klass.from_trusted_dict(sample)
+        validated = klass.from_dict(sample)
+        assert trusted == validated, klass.__name__
+        assert_same(trusted, validated, klass.__name__)
+        checked += 1
+    if not checked:
+        pytest.skip("no models in this package with sample data")
+
+
+def polymorphic_models():
+    """The polymorphic models of the sdk, with sample data for each subtype which has one"""
+    found = []
+    for klass in model_classes():
+        polymorphic = discriminator_map(klass)
+        if polymorphic is None:
+            continue
+        property_name, value_class_map = polymorphic
+        data = {}
+        for value, class_name in value_class_map.items():
+            sample = sample_dict(getattr(TO_BE_REPLACED.models, class_name), {property_name: value})
+            if sample is not None:
+                data[value] = sample
+        if data:
+            found.append((klass, property_name, value_class_map, data))
+    if not found:
+        pytest.skip("no polymorphic models in this package with sample data")
+    return found
+
+
+@pytest.mark.parametrize("from_dict", ["from_dict", "from_trusted_dict"])
+def test_polymorphic_models_dispatch_on_the_discriminator(monkeypatch, from_dict):
+    for klass, property_name, value_class_map, data in polymorphic_models():
+        classes = {}
+        monkeypatch.setattr(klass, f"_{klass.__name__}__discriminator_value_classes", classes)
+        # a mixed list, with each subtype repeated
+        items = [sample for sample in data.values()] * 2
+        models = [getattr(klass, from_dict)(item) for item in items]
+        for item, model in zip(items, models):
+            assert type(model) is getattr(TO_BE_REPLACED.models, value_class_map[item[property_name]])
+        # the class of each value is resolved once and cached
+        assert classes == {value: getattr(TO_BE_REPLACED.models, value_class_map[value]) for value in data}
+
+
+@pytest.mark.parametrize("from_dict", ["from_dict", "from_trusted_dict"])
+def test_polymorphic_models_raise_for_unmapped_discriminator_values(monkeypatch, from_dict):
+    for klass, property_name, value_class_map, data in polymorphic_models():
+        classes = {}
+        monkeypatch.setattr(klass, f"_{klass.__name__}__discriminator_value_classes", classes)
+        sample = dict(next(iter(data.values())), **{property_name: "NotADiscriminatorValue"})
+        with pytest.raises(ValueError, match="failed to lookup discriminator value"):
+            getattr(klass, from_dict)(sample)
+        assert classes == {}
+
+
+def one_of_models(discriminator):
+    """The oneOf models of the sdk with or without a discriminator mapping, and the
+    classes of their model schemas"""
+    found = []
+    for klass in model_classes():
+        if "one_of_schemas" not in klass.__fields__:
+            continue
+        schema_map = klass.__dict__.get(f"_{klass.__name__}__discriminator_schema_map")
+        if bool(schema_map) != discriminator:
+            continue
+        schemas = [getattr(TO_BE_REPLACED.models, name, None) for name in klass.__fields__["one_of_schemas"].default]
+        found.append((klass, schema_map, [schema for schema in schemas if schema is not None]))
+    return found
+
+
+@pytest.mark.parametrize("from_dict", ["from_dict", "from_trusted_dict"])
+def test_one_of_models_dispatch_on_the_discriminator(monkeypatch, from_dict):
+    checked = 0
+    for klass, schema_map, schemas in one_of_models(discriminator=True):
+        classes = {}
+        monkeypatch.setattr(klass, f"_{klass.__name__}__discriminator_schema_classes", classes)
+        property_name = klass.__dict__[f"_{klass.__name__}__discriminator_property_name"]
+        for value, schema_name in schema_map.items():
+            schema = getattr(TO_BE_REPLACED.models, schema_name)
+            sample = sample_dict(schema, {property_name: value})
+            if sample is None:
+                continue
+            # data which other schemas would match too, which only the discriminator tells apart
+            data = {}
+            for other in schemas:
+                data.update(sample_dict(other) or {})
+            data.update(sample)
+            model = getattr(klass, from_dict)(data)
+            assert type(model.actual_instance) is schema
+            assert classes[value] is schema
+            checked += 1
+    if not checked:
+        pytest.skip("no oneOf models with a discriminator in this package with sample data")
+
+
+def test_one_of_models_raise_for_unmapped_discriminator_values():
+    checked = 0
+    for klass, schema_map, schemas in one_of_models(discriminator=True):
+        property_name = klass.__dict__[f"_{klass.__name__}__discriminator_property_name"]
+        for value, schema_name in schema_map.items():
+            sample = sample_dict(getattr(TO_BE_REPLACED.models, schema_name), {property_name: value})
+            if sample is not None:
+                with pytest.raises(ValueError, match="failed to lookup discriminator value"):
+                    klass.from_dict(dict(sample, **{property_name: "NotADiscriminatorValue"}))
+                checked += 1
+                break
+    if not checked:
+        pytest.skip("no oneOf models with a discriminator in this package with sample data")
+
+
+def test_one_of_models_without_a_discriminator_try_each_schema():
+    checked = 0
+    for klass, schema_map, schemas in one_of_models(discriminator=False):
+        for schema in schemas:
+            sample = sample_dict(schema)
+            if sample is None:
+                continue
+            try:
+                model = klass.from_dict(sample)
+            except ValueError as e:
+                # the sample matches several schemas
+                assert "Multiple matches found" in str(e)
+                continue
+            assert type(model.actual_instance) is schema
+            assert type(klass.from_trusted_dict(sample).actual_instance) is schema
+            checked += 1
+    if not checked:
+        pytest.skip("no oneOf models without a discriminator in this package with sample data")
+
+
+def test_one_of_models_accept_none_only_if_nullable():
+    for klass, schema_map, schemas in one_of_models(True) + one_of_models(False):
+        try:
+            klass.construct().actual_instance = None
+            nullable = True
+        except ValueError:
+            nullable = False
+        if nullable:
+            assert klass.from_dict(None).actual_instance is None
+            assert klass.from_trusted_dict(None).actual_instance is None
+            assert klass.from_json(None).to_dict() is None
+        else:
+            with pytest.raises(ValueError):
+                klass.from_dict(None)
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from TO_BE_REPLACED.extensions.paging import ItemIterator, PageIterator
+
+PAGES = {
+    None: SimpleNamespace(values=[1, 2], next_page="p2"),
+    "p2": SimpleNamespace(values=[3], next_page="p3"),
+    "p3": SimpleNamespace(values=[], next_page=None),
+}
+
+
+class SyncLister:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, page=None, limit=None):
+        self.calls.append((page, limit))
+        return PAGES[page]
+
+
+class AsyncLister(SyncLister):
+    async def __call__(self, page=None, limit=None):
+        await asyncio.sleep(0)
+        return super().__call__(page=page, limit=limit)
+
+
+class TestSyncPaging:
+    @pytest.mark.parametrize("prefetch", [False, True])
+    def test_follows_next_page_tokens(self, prefetch):
+        lister = SyncLister()
+        pages = list(PageIterator(lister, prefetch=prefetch, page=None, limit=2))
+        assert pages == [PAGES[None], PAGES["p2"], PAGES["p3"]]
+        assert lister.calls == [(None, 2), ("p2", 2), ("p3", 2)]
+
+    @pytest.mark.parametrize("prefetch", [False, True])
+    def test_iterates_items_of_every_page(self, prefetch):
+        assert list(ItemIterator(SyncLister(), prefetch=prefetch)) == [1, 2, 3]
+
+    def test_starts_from_the_given_page(self):
+        assert list(ItemIterator(SyncLister(), page="p2")) == [3]
+
+    def test_does_not_request_more_pages_than_read(self):
+        lister = SyncLister()
+        pages = iter(PageIterator(lister))
+        next(pages)
+        assert lister.calls == [(None, None)]
+
+    def test_prefetch_requests_next_page_while_current_is_processed(self):
+        requested = threading.Event()
+
+        def lister(page=None):
+            if page == "p2":
+                requested.set()
+            return PAGES[page]
+
+        pages = iter(PageIterator(lister, prefetch=True))
+        next(pages)
+        # the caller is still processing the first page
+        assert requested.wait(timeout=5)
+        pages.close()
+
+    def test_does_not_wait_for_the_prefetch_when_abandoned(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def lister(page=None):
+            if page is not None:
+                started.set()
+                release.wait(timeout=10)
+            return PAGES[page]
+
+        pages = iter(PageIterator(lister, prefetch=True))
+        next(pages)
+        assert started.wait(timeout=5)
+        try:
+            closed = threading.Thread(target=pages.close)
+            closed.start()
+            closed.join(timeout=5)
+            assert not closed.is_alive()
+        finally:
+            release.set()
+
+
+class TestAsyncPaging:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("prefetch", [False, True])
+    async def test_follows_next_page_tokens(self, prefetch):
+        lister = AsyncLister()
+        pages = [page async for page in PageIterator(lister, prefetch=prefetch, limit=2)]
+        assert pages == [PAGES[None], PAGES["p2"], PAGES["p3"]]
+        assert lister.calls == [(None, 2), ("p2", 2), ("p3", 2)]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("prefetch", [False, True])
+    async def test_iterates_items_of_every_page(self, prefetch):
+        assert [item async for item in ItemIterator(AsyncLister(), prefetch=prefetch)] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_prefetch_requests_next_page_while_current_is_processed(self):
+        lister = AsyncLister()
+        pages = PageIterator(lister, prefetch=True).__aiter__()
+        await pages.__anext__()
+        await asyncio.sleep(0.01)
+        assert lister.calls == [(None, None), ("p2", None)]
+        await pages.aclose()
+
+    @pytest.mark.asyncio
+    async def test_cancels_prefetch_when_abandoned(self):
+        started = asyncio.Event()
+
+        async def lister(page=None):
+            if page is not None:
+                started.set()
+                await asyncio.sleep(10)
+            return PAGES[page]
+
+        pages = PageIterator(lister, prefetch=True).__aiter__()
+        await pages.__anext__()
+        await started.wait()
+        prefetch = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        await pages.aclose()
+        await asyncio.sleep(0)
+        assert all(task.cancelled() for task in prefetch)
@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from TO_BE_REPLACED.extensions.rate_limiter import AdaptiveRateLimiter, AsyncAdaptiveRateLimiter
+
+
+def rate_limit(limiter, requests=100, retry_after=None):
+    """Sends requests then rate limits the last of them"""
+    for _ in range(requests):
+        limiter.reserve()
+    limiter.on_rate_limited(retry_after)
+
+
+class TestAdaptiveRateLimiter:
+    def test_does_not_throttle_until_rate_limited(self):
+        limiter = AdaptiveRateLimiter()
+        assert [limiter.reserve() for _ in range(100)] == [0.0] * 100
+        assert limiter.rate is None
+
+    def test_starts_from_half_the_measured_rate_when_rate_limited(self):
+        limiter = AdaptiveRateLimiter()
+        rate_limit(limiter, requests=100)
+        assert limiter.rate == pytest.approx(100 / AdaptiveRateLimiter.MEASUREMENT_WINDOW_SECONDS * 0.5)
+
+    def test_does_not_throttle_a_few_rate_limited_requests(self):
+        limiter = AdaptiveRateLimiter()
+        rate_limit(limiter, requests=AdaptiveRateLimiter.MIN_REQUESTS_TO_THROTTLE - 1)
+        assert limiter.rate is None
+        assert limiter.reserve() == 0.0
+
+    def test_spaces_requests_at_the_target_rate(self):
+        limiter = AdaptiveRateLimiter(min_rate=10, burst_seconds=0)
+        rate_limit(limiter)
+        delays = [limiter.reserve() for _ in range(5)]
+        assert delays == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4], abs=0.01)
+
+    def test_allows_a_burst_after_a_quiet_period(self):
+        limiter = AdaptiveRateLimiter(min_rate=10, burst_seconds=0.5)
+        rate_limit(limiter)
+        delays = [limiter.reserve() for _ in range(8)]
+        assert delays[:5] == pytest.approx([0.0] * 5, abs=0.01)
+        assert delays[5:] == pytest.approx([0.0, 0.1, 0.2], abs=0.01)
+
+    def test_waits_for_retry_after(self):
+        limiter = AdaptiveRateLimiter()
+        limiter.on_rate_limited(retry_after=2)
+        assert limiter.reserve() == pytest.approx(2, abs=0.01)
+
+    def test_decreases_multiplicatively_and_increases_additively(self):
+        limiter = AdaptiveRateLimiter(additive_increase=2)
+        limiter.DECREASE_INTERVAL_SECONDS = 0
+        rate_limit(limiter, requests=100)
+        assert limiter.rate == 10
+        limiter.on_success()
+        assert limiter.rate == pytest.approx(10.2)
+        limiter.on_rate_limited()
+        assert limiter.rate == pytest.approx(5.1)
+
+    def test_decreases_once_for_the_requests_sent_before_a_decrease(self):
+        limiter = AdaptiveRateLimiter()
+        rate_limit(limiter, requests=100)
+        limiter.on_rate_limited()
+        limiter.on_rate_limited()
+        assert limiter.rate == 10
+
+    def test_rate_is_bounded(self):
+        limiter = AdaptiveRateLimiter(min_rate=2, max_rate=3)
+        rate_limit(limiter, requests=100)
+        assert limiter.rate == 3
+        for _ in range(10):
+            limiter.on_success()
+        assert limiter.rate == 3
+        limiter = AdaptiveRateLimiter(min_rate=4)
+        rate_limit(limiter, requests=25)
+        assert limiter.rate == 4
+
+    @pytest.mark.parametrize(
+        "kwargs, message",
+        [
+            ({"min_rate": 0}, "min_rate should be greater than zero but was '0'"),
+            ({"min_rate": 2, "max_rate": 1}, "max_rate should be greater than or equal to min_rate but was '1'"),
+            ({"multiplicative_decrease": 1}, "multiplicative_decrease should be between zero and one but was '1'"),
+        ],
+    )
+    def test_validates_arguments(self, kwargs, message):
+        with pytest.raises(ValueError) as e:
+            AdaptiveRateLimiter(**kwargs)
+        assert str(e.value) == message
+
+    def test_is_thread_safe(self):
+        limiter = AdaptiveRateLimiter(min_rate=1000, burst_seconds=0)
+        rate_limit(limiter)
+        delays = []
+
+        def reserve():
+            for _ in range(100):
+                delays.append(limiter.reserve())
+
+        threads = [threading.Thread(target=reserve) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # every request is given its own slot
+        assert max(delays) == pytest.approx(399 / 1000, abs=0.05)
+
+    def test_acquire_sleeps_for_the_delay(self):
+        limiter = AdaptiveRateLimiter()
+        limiter.on_rate_limited(retry_after=0.1)
+        start = time.monotonic()
+        limiter.acquire()
+        assert time.monotonic() - start >= 0.09
+
+
+class TestAsyncAdaptiveRateLimiter:
+    @pytest.mark.asyncio
+    async def test_acquire_waits_without_blocking_the_event_loop(self):
+        limiter = AsyncAdaptiveRateLimiter()
+        limiter.on_rate_limited(retry_after=0.1)
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.ensure_future(tick())
+        start = time.monotonic()
+        await limiter.acquire()
+        ticker.cancel()
+        assert time.monotonic() - start >= 0.09
+        assert ticks > 5
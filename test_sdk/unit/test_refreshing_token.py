@@ -1,13 +1,16 @@
+import asyncio
+from json import dumps
 from threading import Thread
 from unittest.mock import MagicMock, patch, ANY
 from TO_BE_REPLACED.extensions.configuration_loaders import (
     get_api_configuration,
     EnvironmentVariablesConfigurationLoader,
 )
-from TO_BE_REPLACED.extensions.refreshing_token import RefreshingToken
+from TO_BE_REPLACED.extensions.refreshing_token import AsyncRefreshingToken, RefreshingToken
 from time import sleep, time
 from TO_BE_REPLACED.extensions.proxy_config import ProxyConfig
 import pytest
+from requests import Response
 from datetime import datetime, timedelta
 
 
@@ -510,3 +513,145 @@ offline_access"
                 f"&client_id=test&client_secret=test"
             )
             assert identity_mock.call_args[1]["data"] == expected_request_body
+
+
+class TestRefreshingTokenConcurrency:
+    @staticmethod
+    def token_json(access_token, expires_in=3600):
+        return {"access_token": access_token, "refresh_token": "mock_refresh_token", "expires_in": expires_in}
+
+    def test_valid_token_is_read_without_the_lock(self, config):
+        refreshing_token = RefreshingToken(api_configuration=config)
+        refreshing_token.update_token_data(self.token_json("mock_access_token"))
+        values = []
+        with refreshing_token.lock:
+            thread = Thread(target=lambda: values.append(f"{refreshing_token}"))
+            thread.start()
+            thread.join(timeout=5)
+        assert values == ["mock_access_token"]
+
+    def test_token_is_refreshed_in_the_background_ahead_of_expiry(self, config, valid_response_mock):
+        refreshing_token = RefreshingToken(api_configuration=config, expiry_offset=0, refresh_ahead=120)
+        refreshing_token.update_token_data(self.token_json("expiring_access_token", expires_in=60))
+        with patch("requests.post", return_value=valid_response_mock) as identity_mock:
+            # the current token is used while the new one is requested
+            assert f"{refreshing_token}" == "expiring_access_token"
+            for _ in range(50):
+                if refreshing_token.token_data["access_token"] == "mock_access_token":
+                    break
+                sleep(0.1)
+            assert f"{refreshing_token}" == "mock_access_token"
+            assert identity_mock.call_count == 1
+            assert "grant_type=refresh_token" in identity_mock.call_args.kwargs["data"]
+
+    def test_expired_token_is_refreshed_once_for_all_threads(self, config, valid_response_mock):
+        refreshing_token = RefreshingToken(api_configuration=config)
+        refreshing_token.update_token_data(self.token_json("expired_access_token", expires_in=0))
+
+        def post(*args, **kwargs):
+            sleep(0.1)
+            return valid_response_mock
+
+        values = []
+        with patch("requests.post", side_effect=post) as identity_mock:
+            threads = [Thread(target=lambda: values.append(f"{refreshing_token}")) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert values == ["mock_access_token"] * 5
+        assert identity_mock.call_count == 1
+
+
+class TestAsyncRefreshingToken:
+    @staticmethod
+    def response(status_code, json):
+        response = Response()
+        response.status_code = status_code
+        response._content = dumps(json).encode("utf-8")
+        return response
+
+    @pytest.mark.asyncio
+    async def test_expired_token_is_refreshed_once_for_all_requests(self, config):
+        refreshing_token = AsyncRefreshingToken(api_configuration=config)
+
+        async def post(request_body, headers):
+            await asyncio.sleep(0.05)
+            return self.response(200, {"access_token": "mock_access_token", "refresh_token": "r", "expires_in": 3600})
+
+        with patch.object(refreshing_token, "_post", side_effect=post) as post_mock:
+            await asyncio.gather(*[refreshing_token.refresh_if_needed() for _ in range(5)])
+            assert post_mock.call_count == 1
+            assert "grant_type=password" in post_mock.call_args.args[0]
+            with patch("requests.post") as identity_mock:
+                assert f"{refreshing_token}" == "mock_access_token"
+                identity_mock.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_credentials_when_refresh_token_is_invalid(self, config):
+        refreshing_token = AsyncRefreshingToken(api_configuration=config)
+        refreshing_token.update_token_data({"access_token": "a", "refresh_token": "r", "expires_in": 0})
+        responses = [
+            self.response(400, {"error": "invalid_grant", "error_description": "The refresh token is invalid or expired."}),
+            self.response(200, {"access_token": "mock_access_token", "refresh_token": "r", "expires_in": 3600}),
+        ]
+        with patch.object(refreshing_token, "_post", side_effect=responses) as post_mock:
+            await refreshing_token.refresh_if_needed()
+        assert refreshing_token.token_data["access_token"] == "mock_access_token"
+        assert "grant_type=refresh_token" in post_mock.call_args_list[0].args[0]
+        assert "grant_type=password" in post_mock.call_args_list[1].args[0]
+
+    @pytest.mark.asyncio
+    async def test_token_is_refreshed_in_the_background_ahead_of_expiry(self, config):
+        refreshing_token = AsyncRefreshingToken(api_configuration=config, expiry_offset=0, refresh_ahead=120)
+        refreshing_token.update_token_data({"access_token": "a", "refresh_token": "r", "expires_in": 60})
+        response = self.response(200, {"access_token": "mock_access_token", "refresh_token": "r", "expires_in": 3600})
+        with patch.object(refreshing_token, "_post", return_value=response):
+            await refreshing_token.refresh_if_needed()
+            assert refreshing_token.token_data["access_token"] == "a"
+            await refreshing_token.refresh_task
+        assert refreshing_token.token_data["access_token"] == "mock_access_token"
+
+    @pytest.mark.asyncio
+    async def test_token_read_while_refreshing_ahead_of_expiry_is_not_refreshed_again(self, config):
+        refreshing_token = AsyncRefreshingToken(api_configuration=config, expiry_offset=0, refresh_ahead=120)
+        refreshing_token.update_token_data({"access_token": "a", "refresh_token": "r", "expires_in": 60})
+
+        async def post(request_body, headers):
+            await asyncio.sleep(0.05)
+            return self.response(200, {"access_token": "mock_access_token", "refresh_token": "r", "expires_in": 3600})
+
+        with patch.object(refreshing_token, "_post", side_effect=post) as post_mock, patch("requests.post") as identity_mock:
+            await refreshing_token.refresh_if_needed()
+            # the current token is used while the new one is requested
+            assert f"{refreshing_token}" == "a"
+            await refreshing_token.refresh_task
+            assert f"{refreshing_token}" == "mock_access_token"
+        assert post_mock.call_count == 1
+        identity_mock.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_refresh_uses_the_proxy_from_the_environment(self, config, monkeypatch):
+        requests_seen = []
+
+        async def handle(reader, writer):
+            requests_seen.append((await reader.readline()).decode())
+            while (await reader.readline()) not in (b"\r\n", b""):
+                pass
+            body = dumps({"access_token": "mock_access_token", "refresh_token": "r", "expires_in": 3600}).encode()
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+            await writer.drain()
+            writer.close()
+
+        proxy = await asyncio.start_server(handle, "127.0.0.1", 0)
+        for name in ("NO_PROXY", "no_proxy", "http_proxy"):
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.setenv("HTTP_PROXY", f"http://127.0.0.1:{proxy.sockets[0].getsockname()[1]}")
+        refreshing_token = AsyncRefreshingToken(api_configuration=config)
+        refreshing_token.token_url = "http://identity.example.com/oauth2/token"
+        try:
+            await refreshing_token.refresh_if_needed()
+        finally:
+            proxy.close()
+        assert refreshing_token.token_data["access_token"] == "mock_access_token"
+        assert requests_seen == ["POST http://identity.example.com/oauth2/token HTTP/1.1\r\n"]
@@ -0,0 +1,46 @@
+import pytest
+from TO_BE_REPLACED.exceptions import ApiTypeError
+from TO_BE_REPLACED.request_descriptor import (
+    RequestDescriptor,
+    select_header_accept,
+    select_header_content_type,
+)
+
+
+class TestRequestDescriptor:
+    def test_prefers_json_media_types(self):
+        descriptor = RequestDescriptor(
+            "foo", "POST", "/api/foo",
+            accepts=["text/plain", "application/json"],
+            content_types=["application/json-patch+json", "text/plain"],
+        )
+        assert descriptor.accept == "application/json"
+        assert descriptor.content_type == "application/json-patch+json"
+
+    @pytest.mark.parametrize("select", [select_header_accept, select_header_content_type])
+    def test_selects_first_media_type_if_none_are_json(self, select):
+        assert select(["text/csv", "text/plain"]) == "text/csv"
+        assert select([]) is None
+
+    def test_allows_parameters_and_standard_kwargs(self):
+        descriptor = RequestDescriptor("foo", "GET", "/api/foo/{scope}", params=["scope", "limit"])
+        descriptor.validate_kwargs({"limit": 10, "opts": None, "_headers": {}, "async_req": True})
+
+    def test_rejects_unexpected_kwargs(self):
+        descriptor = RequestDescriptor("foo", "GET", "/api/foo", params=["limit"])
+        with pytest.raises(ApiTypeError) as e:
+            descriptor.validate_kwargs({"limit": 10, "lmit": 10})
+        assert str(e.value) == "Got an unexpected keyword argument 'lmit' to method foo"
+
+    def test_allows_host_index_only_with_hosts(self):
+        with pytest.raises(ApiTypeError):
+            RequestDescriptor("foo", "GET", "/api/foo").validate_kwargs({"_host_index": 1})
+        descriptor = RequestDescriptor("foo", "GET", "/api/foo", hosts=["https://a", "https://b"])
+        descriptor.validate_kwargs({"_host_index": 1})
+
+    def test_defaults_maps_to_empty(self):
+        descriptor = RequestDescriptor("foo", "DELETE", "/api/foo")
+        assert descriptor.response_types_map == {}
+        assert descriptor.collection_formats == {}
+        assert descriptor.accept is None
+        assert descriptor.content_type is None
@@ -1,6 +1,8 @@
+import gzip
 from unittest.mock import AsyncMock, MagicMock
 import aiohttp
 import TO_BE_REPLACED.extensions.rest
+from TO_BE_REPLACED.extensions.configuration_options import ConfigurationOptions
 import TO_BE_REPLACED.rest
 import pytest
 import urllib3
@@ -13,7 +15,7 @@ class TestAsyncRest:
     ):
         rest_client = TO_BE_REPLACED.rest.RESTClientObject(TO_BE_REPLACED.Configuration.get_default())
         rest_client.pool_manager = AsyncMock(aiohttp.ClientSession)
-        expected_response = "response"
+        expected_response = MagicMock(aiohttp.ClientResponse, status=200)
         rest_client.pool_manager.request = AsyncMock(return_value=expected_response)
         print(rest_client.pool_manager.request)
         headers = {"Content-Type": "text/plain"}
@@ -32,7 +34,8 @@ class TestAsyncRest:
         rest_client = TO_BE_REPLACED.rest.RESTClientObject(TO_BE_REPLACED.Configuration.get_default())
         rest_client.pool_manager = AsyncMock(aiohttp.ClientSession)
 
-        expected_response = {"Content-Type": "text/plain", "Content-Length":"17", "version": "2.45"}
+        expected_headers = {"Content-Type": "text/plain", "Content-Length":"17", "version": "2.45"}
+        expected_response = MagicMock(aiohttp.ClientResponse, status=200)
 
         rest_client.pool_manager.request = AsyncMock(return_value=expected_response)
         headers = {"Content-Type": "text/plain", "Content-Length":17, "version": 2.45}
@@ -48,9 +51,21 @@ class TestAsyncRest:
         args, kwargs = rest_client.pool_manager.request.call_args
         passed_headers = kwargs['headers']
 
-        assert expected_response == passed_headers
+        assert expected_headers == passed_headers
         assert expected_response == response
 
+    @pytest.mark.asyncio
+    async def test_reads_and_raises_error_responses_if_not_preloading(self):
+        rest_client = TO_BE_REPLACED.rest.RESTClientObject(TO_BE_REPLACED.Configuration.get_default())
+        rest_client.pool_manager = AsyncMock(aiohttp.ClientSession)
+        error_response = MagicMock(aiohttp.ClientResponse, status=503, reason="Service Unavailable")
+        error_response.read = AsyncMock(return_value=b"unavailable")
+        rest_client.pool_manager.request = AsyncMock(return_value=error_response)
+        with pytest.raises(TO_BE_REPLACED.ApiException) as e:
+            await rest_client.request("GET", "https://www.lusid.com/api", _preload_content=False)
+        assert e.value.status == 503
+        assert e.value.body == b"unavailable"
+
 
 class TestSyncRest:
     def test_request_with_plaintext_content_type_calls_req_with_str_data_param(self):
@@ -92,4 +107,50 @@ class TestSyncRest:
             body=message,
             _preload_content=False,
         )
-        assert expected_response == response
\ No newline at end of file
+        assert expected_response == response
+
+class TestCompression:
+    def test_sync_client_asks_for_compressed_responses_and_gzips_large_bodies(self):
+        config = TO_BE_REPLACED.Configuration(request_compression_min_bytes=10)
+        rest_client = TO_BE_REPLACED.extensions.rest.RESTClientObject(config)
+        rest_client.pool_manager = MagicMock(urllib3.PoolManager)
+        rest_client.pool_manager.request.return_value = urllib3.response.HTTPResponse(body=b"", status=200)
+        rest_client.request("POST", "https://www.lusid.com/api", body=b'{"a": "large enough"}')
+        args, kwargs = rest_client.pool_manager.request.call_args
+        assert gzip.decompress(kwargs["body"]) == b'{"a": "large enough"}'
+        assert kwargs["headers"]["Content-Encoding"] == "gzip"
+        assert kwargs["headers"]["Accept-Encoding"] == urllib3.util.request.ACCEPT_ENCODING
+
+    def test_sync_client_options_override_configuration(self):
+        rest_client = TO_BE_REPLACED.extensions.rest.RESTClientObject(TO_BE_REPLACED.Configuration())
+        rest_client.pool_manager = MagicMock(urllib3.PoolManager)
+        rest_client.pool_manager.request.return_value = urllib3.response.HTTPResponse(body=b"", status=200)
+        opts = ConfigurationOptions(accept_compressed_responses=False, request_compression_min_bytes=10_000)
+        rest_client.request("POST", "https://www.lusid.com/api", body=b'{"a": "small"}', opts=opts)
+        args, kwargs = rest_client.pool_manager.request.call_args
+        assert kwargs["body"] == b'{"a": "small"}'
+        assert "Accept-Encoding" not in kwargs["headers"]
+        assert "Content-Encoding" not in kwargs["headers"]
+
+    @pytest.mark.asyncio
+    async def test_async_client_gzips_large_bodies(self):
+        config = TO_BE_REPLACED.Configuration(request_compression_min_bytes=10)
+        rest_client = TO_BE_REPLACED.rest.RESTClientObject(config)
+        rest_client.pool_manager = AsyncMock(aiohttp.ClientSession)
+        rest_client.pool_manager.request = AsyncMock(return_value=MagicMock(aiohttp.ClientResponse, status=200))
+        await rest_client.request("POST", "https://www.lusid.com/api", body=b'{"a": "large enough"}', _preload_content=False)
+        args, kwargs = rest_client.pool_manager.request.call_args
+        assert gzip.decompress(kwargs["data"]) == b'{"a": "large enough"}'
+        assert kwargs["headers"]["Content-Encoding"] == "gzip"
+        # aiohttp asks for the encodings it can decode
+        assert "Accept-Encoding" not in kwargs["headers"]
+
+    @pytest.mark.asyncio
+    async def test_async_client_asks_for_uncompressed_responses_if_not_accepting_them(self):
+        rest_client = TO_BE_REPLACED.rest.RESTClientObject(TO_BE_REPLACED.Configuration())
+        rest_client.pool_manager = AsyncMock(aiohttp.ClientSession)
+        rest_client.pool_manager.request = AsyncMock(return_value=MagicMock(aiohttp.ClientResponse, status=200))
+        opts = ConfigurationOptions(accept_compressed_responses=False)
+        await rest_client.request("GET", "https://www.lusid.com/api", _preload_content=False, opts=opts)
+        args, kwargs = rest_client.pool_manager.request.call_args
+        assert kwargs["headers"]["Accept-Encoding"] == "identity"
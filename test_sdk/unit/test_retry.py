@@ -1,11 +1,17 @@
 from unittest import mock
-from TO_BE_REPLACED.extensions.retry import RetryingRestWrapper, RetryingRestWrapperAsync
+from TO_BE_REPLACED.extensions.retry import RetryBudget, RetryingRestWrapper, RetryingRestWrapperAsync, get_backoff_seconds
+from TO_BE_REPLACED.extensions.configuration_options import ConfigurationOptions
+from TO_BE_REPLACED.extensions.rate_limiter import AdaptiveRateLimiter
 from TO_BE_REPLACED.extensions.rest import RESTClientObject
 from TO_BE_REPLACED.rest import RESTClientObject as AsyncRestClientObject
 from TO_BE_REPLACED.configuration import Configuration
 from TO_BE_REPLACED import ApiException
 from TO_BE_REPLACED.rest import RESTResponse
+import aiohttp
+import asyncio
+import time
 import pytest
+import urllib3
 
 
 class TestSyncRetryRestWrapper():
@@ -61,6 +67,102 @@ class TestSyncRetryRestWrapper():
             assert rest_object_mock.request.call_count == 2
 
 
+    def test_rate_limited_requests_are_throttled_by_the_shared_rate_limiter(self):
+        rest_object_mock = RESTClientObject(Configuration())
+        http_resp = RESTResponse(resp=mock.MagicMock(status=429), data=None)
+        http_resp.getheaders = mock.MagicMock(return_value={"Retry-After": 0.1})
+        rest_object_mock.request = mock.MagicMock(side_effect=[ApiException(http_resp=http_resp), "OK"])
+        rate_limiter = AdaptiveRateLimiter()
+        retry_object = RetryingRestWrapper(rest_object=rest_object_mock, rate_limiter=rate_limiter)
+        start = time.monotonic()
+        assert retry_object.request("GET", "") == "OK"
+        assert time.monotonic() - start >= 0.09
+        assert retry_object.rate_limiter is rate_limiter
+
+    def test_rate_limit_retries_of_the_options_override_the_wrapper(self):
+        rest_object_mock = RESTClientObject(Configuration())
+        http_resp = RESTResponse(resp=mock.MagicMock(status=429), data=None)
+        http_resp.getheaders = mock.MagicMock(return_value={"Retry-After": 0})
+        rest_object_mock.request = mock.MagicMock(side_effect=[ApiException(http_resp=http_resp), "OK"])
+        retry_object = RetryingRestWrapper(rest_object=rest_object_mock, rate_limit_retries=1)
+        with pytest.raises(ApiException):
+            retry_object.request("GET", "", opts=ConfigurationOptions(rate_limit_retries=0))
+        assert rest_object_mock.request.call_count == 1
+        assert retry_object.request("GET", "", opts=ConfigurationOptions()) == "OK"
+        assert rest_object_mock.request.call_count == 2
+
+    def test_errors_if_invalid_retry_after_header(self):
+        rest_object_mock = RESTClientObject(Configuration())
+        http_resp = RESTResponse(resp=mock.MagicMock(status=429), data=None)
+        http_resp.getheaders = mock.MagicMock(return_value={"Retry-After": "soon"})
+        rest_object_mock.request = mock.MagicMock(side_effect=[ApiException(http_resp=http_resp), "OK"])
+        retry_object = RetryingRestWrapper(rest_object=rest_object_mock)
+        with pytest.raises(ValueError, match="invalid Retry-After header value: soon"):
+            retry_object.request("GET", "")
+
+    def test_errors_if_invalid_retry_backoff_base_ms_value(self):
+        with pytest.raises(ValueError) as e:
+            RetryingRestWrapper(None, retry_backoff_base_ms=-1)
+        assert str(e.value) == "retry_backoff_base_ms should be greater than or equal to zero but was '-1'"
+
+    @pytest.mark.parametrize("status, method, expected_call_count", [
+        (503, "POST", 2),
+        (500, "GET", 2),
+        (500, "POST", 1),
+        (400, "GET", 1),
+    ])
+    def test_server_errors_without_retry_after_are_retried_with_backoff(self, status, method, expected_call_count):
+        rest_object_mock = RESTClientObject(Configuration())
+        http_resp = RESTResponse(resp=mock.MagicMock(status=status), data=None)
+        http_resp.getheaders = mock.MagicMock(return_value={})
+        rest_object_mock.request = mock.MagicMock(side_effect=[ApiException(http_resp=http_resp), "OK"])
+        retry_object = RetryingRestWrapper(rest_object=rest_object_mock, retries=1)
+        with mock.patch("TO_BE_REPLACED.extensions.retry.time.sleep") as sleep:
+            if expected_call_count == 1:
+                with pytest.raises(ApiException):
+                    retry_object.request(method, "")
+            else:
+                assert retry_object.request(method, "") == "OK"
+        assert rest_object_mock.request.call_count == expected_call_count
+        assert sleep.call_count == expected_call_count - 1
+        assert all(0 <= call.args[0] <= 0.1 for call in sleep.call_args_list)
+
+    @pytest.mark.parametrize("method, expected_call_count", [("GET", 2), ("POST", 1)])
+    def test_connection_resets_of_idempotent_requests_are_retried(self, method, expected_call_count):
+        rest_object_mock = RESTClientObject(Configuration())
+        rest_object_mock.request = mock.MagicMock(side_effect=[urllib3.exceptions.ProtocolError("reset"), "OK"])
+        retry_object = RetryingRestWrapper(rest_object=rest_object_mock, retry_backoff_base_ms=1)
+        if expected_call_count == 1:
+            with pytest.raises(urllib3.exceptions.ProtocolError):
+                retry_object.request(method, "")
+        else:
+            assert retry_object.request(method, "") == "OK"
+        assert rest_object_mock.request.call_count == expected_call_count
+
+    def test_retries_are_limited_by_the_retry_budget(self):
+        rest_object_mock = RESTClientObject(Configuration())
+        rest_object_mock.request = mock.MagicMock(side_effect=ConnectionResetError())
+        retry_budget = RetryBudget(min_retries_per_second=0)
+        retry_object = RetryingRestWrapper(
+            rest_object=rest_object_mock, retry_backoff_base_ms=0, retry_budget=retry_budget, retry_budget_percent=50
+        )
+        for _ in range(4):
+            with pytest.raises(ConnectionResetError):
+                retry_object.request("GET", "")
+        # 4 requests may have 2 retries between them
+        assert rest_object_mock.request.call_count == 6
+        # the budget can be raised per request
+        with pytest.raises(ConnectionResetError):
+            retry_object.request("GET", "", opts=ConfigurationOptions(retry_budget_percent=100))
+        assert rest_object_mock.request.call_count == 6 + 1 + 3
+
+    def test_backoff_is_exponential_with_full_jitter(self):
+        with mock.patch("TO_BE_REPLACED.extensions.retry.random.uniform", side_effect=lambda a, b: b):
+            assert [get_backoff_seconds(n, 100, 1000) for n in range(5)] == [0.1, 0.2, 0.4, 0.8, 1.0]
+        with mock.patch("TO_BE_REPLACED.extensions.retry.random.uniform", side_effect=lambda a, b: a):
+            assert get_backoff_seconds(3, 100, 1000) == 0
+
+
 @pytest.mark.asyncio
 class TestASyncRetryRestWrapper():
     def test_errors_if_invalid_retries_type(self):
@@ -116,3 +218,72 @@ class TestASyncRetryRestWrapper():
             assert result == "OK"
             assert rest_object_mock.request.call_count == 2
         await rest_object_mock.close()
+
+    async def test_rate_limited_request_backs_off_other_requests(self):
+        rest_object_mock = AsyncRestClientObject(Configuration())
+        http_resp = RESTResponse(resp=mock.MagicMock(status=429), data=None)
+        http_resp.getheaders = mock.MagicMock(return_value={"Retry-After": 0.2})
+        call_times = []
+
+        async def request(method, url, *args):
+            call_times.append((url, time.monotonic()))
+            if len(call_times) == 1:
+                raise ApiException(http_resp=http_resp)
+            return "OK"
+
+        rest_object_mock.request = request
+        retry_object = RetryingRestWrapperAsync(rest_object=rest_object_mock)
+        rate_limited = asyncio.ensure_future(retry_object.request("GET", "first"))
+        await asyncio.sleep(0.05)
+        assert await retry_object.request("GET", "second") == "OK"
+        assert await rate_limited == "OK"
+        first_call_time = call_times[0][1]
+        assert sorted(url for url, _ in call_times) == ["first", "first", "second"]
+        assert all(t - first_call_time >= 0.19 for _, t in call_times[1:])
+        await rest_object_mock.close()
+
+    async def test_rate_limit_retries_of_the_options_override_the_wrapper(self):
+        rest_object_mock = AsyncRestClientObject(Configuration())
+        http_resp = RESTResponse(resp=mock.MagicMock(status=429), data=None)
+        http_resp.getheaders = mock.MagicMock(return_value={"Retry-After": 0})
+        rest_object_mock.request = mock.AsyncMock(side_effect=[ApiException(http_resp=http_resp), "OK"])
+        retry_object = RetryingRestWrapperAsync(rest_object=rest_object_mock, rate_limit_retries=1)
+        with pytest.raises(ApiException):
+            await retry_object.request("GET", "", opts=ConfigurationOptions(rate_limit_retries=0))
+        assert rest_object_mock.request.call_count == 1
+        assert await retry_object.request("GET", "", opts=ConfigurationOptions()) == "OK"
+        assert rest_object_mock.request.call_count == 2
+        await rest_object_mock.close()
+
+    async def test_errors_if_invalid_retry_after_header(self):
+        rest_object_mock = AsyncRestClientObject(Configuration())
+        http_resp = RESTResponse(resp=mock.MagicMock(status=429), data=None)
+        http_resp.getheaders = mock.MagicMock(return_value={"Retry-After": "soon"})
+        rest_object_mock.request = mock.AsyncMock(side_effect=[ApiException(http_resp=http_resp), "OK"])
+        retry_object = RetryingRestWrapperAsync(rest_object=rest_object_mock)
+        with pytest.raises(ValueError, match="invalid Retry-After header value: soon"):
+            await retry_object.request("GET", "")
+        await rest_object_mock.close()
+
+    async def test_server_errors_without_retry_after_are_retried_with_backoff(self):
+        rest_object_mock = AsyncRestClientObject(Configuration())
+        http_resp = RESTResponse(resp=mock.MagicMock(status=502), data=None)
+        http_resp.getheaders = mock.MagicMock(return_value={})
+        rest_object_mock.request = mock.AsyncMock(side_effect=[ApiException(http_resp=http_resp), "OK"])
+        retry_object = RetryingRestWrapperAsync(rest_object=rest_object_mock, retry_backoff_base_ms=1)
+        assert await retry_object.request("POST", "") == "OK"
+        assert rest_object_mock.request.call_count == 2
+        await rest_object_mock.close()
+
+    @pytest.mark.parametrize("method, expected_call_count", [("DELETE", 2), ("PATCH", 1)])
+    async def test_connection_resets_of_idempotent_requests_are_retried(self, method, expected_call_count):
+        rest_object_mock = AsyncRestClientObject(Configuration())
+        rest_object_mock.request = mock.AsyncMock(side_effect=[aiohttp.ServerDisconnectedError(), "OK"])
+        retry_object = RetryingRestWrapperAsync(rest_object=rest_object_mock, retry_backoff_base_ms=1)
+        if expected_call_count == 1:
+            with pytest.raises(aiohttp.ServerDisconnectedError):
+                await retry_object.request(method, "")
+        else:
+            assert await retry_object.request(method, "") == "OK"
+        assert rest_object_mock.request.call_count == expected_call_count
+        await rest_object_mock.close()
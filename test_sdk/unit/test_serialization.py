@@ -0,0 +1,82 @@
+import json
+from datetime import date, datetime, timezone
+from enum import Enum
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock
+
+from pydantic.v1 import BaseModel, Field, StrictStr
+
+from TO_BE_REPLACED.serialization import JsonReadySerializer, to_json_bytes
+
+
+class Side(str, Enum):
+    BUY = "Buy"
+
+
+class Leg(BaseModel):
+    """Shaped like a generated model"""
+    leg_id: StrictStr = Field(..., alias="legId")
+    href: Optional[StrictStr] = None
+    comment: Optional[StrictStr] = None
+    _read_only_fields = frozenset(["href"])
+    _nullable_fields = frozenset(["comment"])
+
+    class Config:
+        allow_population_by_field_name = True
+
+
+class Order(BaseModel):
+    """Shaped like a generated model with additional properties"""
+    side: Side
+    trade_date: Optional[datetime] = Field(None, alias="tradeDate")
+    legs: Optional[List[Leg]] = None
+    legs_by_id: Optional[Dict[str, Leg]] = Field(None, alias="legsById")
+    additional_properties: Dict[str, Any] = {}
+    _read_only_fields = frozenset([])
+    _nullable_fields = frozenset([])
+
+    class Config:
+        allow_population_by_field_name = True
+
+
+class WithToDict:
+    def to_dict(self):
+        return {"settles": date(2024, 1, 2)}
+
+
+class TestJsonReadySerializer:
+    def test_serializes_primitives_and_containers(self):
+        serialize = JsonReadySerializer()
+        assert serialize(None) is None
+        assert serialize([1, 2.5, "a", True, b"b"]) == [1, 2.5, "a", True, b"b"]
+        assert serialize((1, date(2024, 1, 2))) == (1, "2024-01-02")
+        assert serialize({"a": {"b": [datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)]}}) == \
+            {"a": {"b": ["2024-01-02T03:04:05+00:00"]}}
+
+    def test_serializes_models_by_alias_leaving_out_read_only_and_unset_fields(self):
+        leg = Leg(leg_id="1", href="http://leg/1")
+        order = Order(side=Side.BUY, trade_date=datetime(2024, 1, 2), legs=[leg], legs_by_id={"1": leg})
+        order.additional_properties["venue"] = "XLON"
+        assert JsonReadySerializer()(order) == {
+            "side": "Buy",
+            "tradeDate": "2024-01-02T00:00:00",
+            "legs": [{"legId": "1"}],
+            "legsById": {"1": {"legId": "1"}},
+            "venue": "XLON",
+        }
+
+    def test_includes_nullable_fields_set_to_none(self):
+        assert JsonReadySerializer()(Leg(leg_id="1", comment=None)) == {"legId": "1", "comment": None}
+
+    def test_serializes_other_objects_with_to_dict(self):
+        assert JsonReadySerializer()([WithToDict()]) == [{"settles": "2024-01-02"}]
+
+    def test_encodes_to_utf8_bytes_with_codec(self):
+        codec = MagicMock()
+        codec.dumps.return_value = '{"legId": "é"}'
+        assert JsonReadySerializer().encode(Leg(leg_id="é"), codec) == '{"legId": "é"}'.encode("utf-8")
+        codec.dumps.assert_called_once_with({"legId": "é"})
+
+
+def test_to_json_bytes():
+    assert json.loads(to_json_bytes([Leg(leg_id="1", href="h")])) == [{"legId": "1"}]
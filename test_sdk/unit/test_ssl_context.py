@@ -0,0 +1,166 @@
+import ssl
+
+import pytest
+
+from TO_BE_REPLACED.configuration import Configuration
+from TO_BE_REPLACED.extensions.rest import RESTClientObject as SyncRESTClientObject
+from TO_BE_REPLACED.rest import RESTClientObject
+from TO_BE_REPLACED.ssl_context import ResumingSSLContext, clear_ssl_contexts, get_ssl_context
+
+
+@pytest.fixture(autouse=True)
+def clear_contexts():
+    clear_ssl_contexts()
+    yield
+    clear_ssl_contexts()
+
+
+class FakeSession:
+    def __init__(self, has_ticket=True):
+        self.has_ticket = has_ticket
+
+
+class FakeConnection:
+    def __init__(self, session, server_hostname="www.lusid.com", version="TLSv1.3"):
+        self.session = session
+        self.server_hostname = server_hostname
+        self.__version = version
+
+    def version(self):
+        return self.__version
+
+
+class FakeSocketConnection(FakeConnection):
+    def __init__(self, session, port, **kwargs):
+        super().__init__(session, **kwargs)
+        self.port = port
+
+    def getpeername(self):
+        return ("10.0.0.1", self.port)
+
+
+@pytest.fixture
+def offered(monkeypatch):
+    """Records the sessions offered by ResumingSSLContext.wrap_bio"""
+    sessions = []
+
+    def wrap_bio(self, incoming, outgoing, server_side=False, server_hostname=None, session=None):
+        sessions.append(session)
+
+    def wrap_socket(self, sock, server_side=False, server_hostname=None, session=None):
+        sessions.append(session)
+
+    monkeypatch.setattr(ssl.SSLContext, "wrap_bio", wrap_bio)
+    monkeypatch.setattr(ssl.SSLContext, "wrap_socket", wrap_socket)
+    return sessions
+
+
+def test_returns_the_same_context_for_the_same_settings():
+    assert get_ssl_context() is get_ssl_context()
+    assert isinstance(get_ssl_context(), ResumingSSLContext)
+
+
+def test_returns_different_contexts_for_different_settings():
+    context = get_ssl_context()
+    assert get_ssl_context(verify=False) is not context
+    assert get_ssl_context(library="urllib3") is not context
+
+
+def test_clear_ssl_contexts_builds_new_contexts():
+    context = get_ssl_context()
+    clear_ssl_contexts()
+    assert get_ssl_context() is not context
+
+
+def test_verifies_servers_by_default():
+    context = get_ssl_context()
+    assert context.verify_mode == ssl.CERT_REQUIRED
+    assert context.check_hostname
+
+
+def test_sets_the_verify_flags_of_the_default_context():
+    assert get_ssl_context().verify_flags == ssl.create_default_context().verify_flags
+
+
+def test_does_not_verify_servers_when_verify_is_false():
+    context = get_ssl_context(verify=False)
+    assert context.verify_mode == ssl.CERT_NONE
+    assert not context.check_hostname
+
+
+def test_offers_the_latest_session_saved_for_the_host(offered):
+    context = ResumingSSLContext()
+    context.wrap_bio(ssl.MemoryBIO(), ssl.MemoryBIO(), server_hostname="www.lusid.com")
+    first, second = FakeSession(), FakeSession()
+    assert context._save_session(FakeConnection(first))
+    context.wrap_bio(ssl.MemoryBIO(), ssl.MemoryBIO(), server_hostname="www.lusid.com")
+    assert context._save_session(FakeConnection(second))
+    context.wrap_bio(ssl.MemoryBIO(), ssl.MemoryBIO(), server_hostname="www.lusid.com")
+    context.wrap_bio(ssl.MemoryBIO(), ssl.MemoryBIO(), server_hostname="other.lusid.com")
+    assert offered == [None, first, second, None]
+
+
+def test_waits_for_the_ticket_of_a_tls_1_3_session(offered):
+    context = ResumingSSLContext()
+    assert not context._save_session(FakeConnection(FakeSession(has_ticket=False)))
+    context.wrap_bio(ssl.MemoryBIO(), ssl.MemoryBIO(), server_hostname="www.lusid.com")
+    tls_1_2_session = FakeSession(has_ticket=False)
+    assert context._save_session(FakeConnection(tls_1_2_session, version="TLSv1.2"))
+    context.wrap_bio(ssl.MemoryBIO(), ssl.MemoryBIO(), server_hostname="www.lusid.com")
+    assert offered == [None, tls_1_2_session]
+
+
+def test_keeps_the_sessions_of_sockets_per_port(offered):
+    context = ResumingSSLContext()
+    first, second = FakeSession(), FakeSession()
+    assert context._save_session(FakeSocketConnection(first, 443))
+    assert context._save_session(FakeSocketConnection(second, 8443))
+    context.wrap_socket(FakeSocketConnection(None, 443), server_hostname="www.lusid.com")
+    context.wrap_socket(FakeSocketConnection(None, 8443), server_hostname="www.lusid.com")
+    context.wrap_socket(FakeSocketConnection(None, 9443), server_hostname="www.lusid.com")
+    # asyncio doesn't pass the port, its sessions are kept per host name only
+    context.wrap_bio(ssl.MemoryBIO(), ssl.MemoryBIO(), server_hostname="www.lusid.com")
+    assert offered == [first, second, None, None]
+
+
+def test_does_not_replace_a_session_passed_explicitly(offered):
+    context = ResumingSSLContext()
+    context._save_session(FakeConnection(FakeSession()))
+    session = FakeSession()
+    context.wrap_bio(ssl.MemoryBIO(), ssl.MemoryBIO(), server_hostname="www.lusid.com", session=session)
+    assert offered == [session]
+
+
+def test_wraps_connections_which_save_their_sessions():
+    context = ResumingSSLContext()
+    connection = context.wrap_bio(ssl.MemoryBIO(), ssl.MemoryBIO(), server_hostname="www.lusid.com")
+    assert isinstance(connection, context.sslobject_class)
+    assert context.sslobject_class is not ssl.SSLObject
+    assert context.sslsocket_class is not ssl.SSLSocket
+
+
+@pytest.mark.asyncio
+async def test_async_rest_clients_share_the_context():
+    first = RESTClientObject(Configuration(host="https://www.lusid.com/api"))
+    second = RESTClientObject(Configuration(host="https://www.lusid.com/api"))
+    try:
+        assert first.pool_manager.connector._ssl is second.pool_manager.connector._ssl
+        assert first.pool_manager.connector._ssl is get_ssl_context(library="aiohttp")
+    finally:
+        await first.close()
+        await second.close()
+
+
+def test_sync_rest_clients_share_the_context():
+    first = SyncRESTClientObject(Configuration(host="https://www.lusid.com/api"))
+    second = SyncRESTClientObject(Configuration(host="https://www.lusid.com/api"))
+    context = get_ssl_context(library="urllib3")
+    assert first.pool_manager.connection_pool_kw["ssl_context"] is context
+    assert second.pool_manager.connection_pool_kw["ssl_context"] is context
+
+
+def test_sync_rest_client_builds_its_own_context_with_assert_hostname():
+    config = Configuration(host="https://www.lusid.com/api")
+    config.assert_hostname = "lusid.com"
+    rest_client = SyncRESTClientObject(config)
+    assert "ssl_context" not in rest_client.pool_manager.connection_pool_kw
@@ -0,0 +1,106 @@
+import os
+import stat
+from datetime import datetime, timedelta
+from threading import Thread
+from time import sleep
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from TO_BE_REPLACED.extensions.configuration_loaders import (
+    get_api_configuration,
+    EnvironmentVariablesConfigurationLoader,
+)
+from TO_BE_REPLACED.extensions.refreshing_token import RefreshingToken
+from TO_BE_REPLACED.extensions.token_cache import FileTokenCache
+
+
+@pytest.fixture
+def config():
+    return get_api_configuration([EnvironmentVariablesConfigurationLoader()])
+
+
+@pytest.fixture
+def token_cache(tmp_path):
+    return FileTokenCache(str(tmp_path / "tokens"))
+
+
+@pytest.fixture
+def valid_response_mock():
+    valid_response_mock = MagicMock()
+    valid_response_mock.status_code = 200
+    valid_response_mock.json.return_value = {
+        "access_token": "mock_access_token",
+        "refresh_token": "mock_refresh_token",
+        "expires_in": 3600,
+    }
+    return valid_response_mock
+
+
+def token_data(access_token, expires_in):
+    return {
+        "access_token": access_token,
+        "refresh_token": "cached_refresh_token",
+        "expires": datetime.utcnow() + timedelta(seconds=expires_in),
+    }
+
+
+class TestFileTokenCache:
+    def test_stores_and_loads_token_data(self, token_cache):
+        data = token_data("cached_access_token", 600)
+        token_cache.store("key", data)
+        assert token_cache.load("key") == data
+
+    def test_token_file_is_only_readable_by_the_user(self, token_cache):
+        token_cache.store("key", token_data("cached_access_token", 600))
+        mode = os.stat(os.path.join(token_cache.directory, "key.json")).st_mode
+        assert stat.S_IMODE(mode) == 0o600
+
+    def test_missing_or_invalid_token_is_not_loaded(self, token_cache):
+        assert token_cache.load("key") is None
+        with open(os.path.join(token_cache.directory, "key.json"), "w") as token_file:
+            token_file.write("{not json")
+        assert token_cache.load("key") is None
+
+    def test_keys_differ_by_credentials(self):
+        assert FileTokenCache.get_key("url", "client", "user") != FileTokenCache.get_key("url", "client", "other")
+
+    def test_from_environment(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("FBN_TOKEN_CACHE_DIR", raising=False)
+        assert FileTokenCache.from_environment() is None
+        monkeypatch.setenv("FBN_TOKEN_CACHE_DIR", str(tmp_path))
+        assert FileTokenCache.from_environment().directory == str(tmp_path)
+
+
+class TestRefreshingTokenWithCache:
+    def test_uses_token_cached_by_another_process(self, config, token_cache):
+        first = RefreshingToken(api_configuration=config, token_cache=token_cache)
+        token_cache.store(first._get_cache_key(), token_data("cached_access_token", 600))
+        with patch("requests.post") as identity_mock:
+            assert f"{first}" == "cached_access_token"
+            identity_mock.assert_not_called()
+
+    def test_one_token_refreshes_for_all_sharing_the_cache(self, config, token_cache, valid_response_mock):
+        tokens = [RefreshingToken(api_configuration=config, token_cache=token_cache) for _ in range(5)]
+
+        def post(*args, **kwargs):
+            sleep(0.1)
+            return valid_response_mock
+
+        values = []
+        with patch("requests.post", side_effect=post) as identity_mock:
+            threads = [Thread(target=lambda token=token: values.append(f"{token}")) for token in tokens]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert values == ["mock_access_token"] * 5
+        assert identity_mock.call_count == 1
+        assert token_cache.load(tokens[0]._get_cache_key())["access_token"] == "mock_access_token"
+
+    def test_refreshes_expired_cached_token_with_its_refresh_token(self, config, token_cache, valid_response_mock):
+        refreshing_token = RefreshingToken(api_configuration=config, token_cache=token_cache)
+        token_cache.store(refreshing_token._get_cache_key(), token_data("expired_access_token", -10))
+        with patch("requests.post", return_value=valid_response_mock) as identity_mock:
+            assert f"{refreshing_token}" == "mock_access_token"
+        assert "refresh_token=cached_refresh_token" in identity_mock.call_args.kwargs["data"]
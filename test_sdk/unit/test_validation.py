@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from pydantic.v1 import StrictInt, ValidationError
+
+from TO_BE_REPLACED.validation import validate_arguments
+
+
+class FakeApi:
+    def __init__(self, client_side_validation):
+        self.api_client = SimpleNamespace(client_side_validation=client_side_validation)
+
+    @validate_arguments
+    def upsert(self, values: List[StrictInt], **kwargs):
+        return values, kwargs
+
+
+class TestValidateArguments:
+    def test_validates_arguments_by_default(self):
+        with pytest.raises(ValidationError):
+            FakeApi(client_side_validation=True).upsert(["not an int"])
+
+    def test_skips_validation_when_client_side_validation_is_off(self):
+        values, kwargs = FakeApi(client_side_validation=False).upsert(["not an int"], opts=None)
+        assert values == ["not an int"]
+        assert kwargs == {"opts": None}
+
+    def test_validates_if_api_client_has_no_setting(self):
+        api = FakeApi(client_side_validation=True)
+        api.api_client = object()
+        with pytest.raises(ValidationError):
+            api.upsert(["not an int"])
+
+    def test_exposes_raw_function(self):
+        api = FakeApi(client_side_validation=True)
+        assert api.upsert.raw_function(api, ["not an int"]) == (["not an int"], {})